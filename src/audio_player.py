@@ -1,11 +1,24 @@
 import logging
-import queue
+import os
 import threading
 import time
-import sounddevice as sd
-import soundfile as sf
-from typing import Optional, Dict, Any, List # add list here
-from typing import Optional
+import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# optional: resample to the device's native rate ourselves instead of leaving it to portaudio/the host api
+try:
+    import soxr
+    _soxr_available = True
+except ImportError:
+    soxr = None
+    _soxr_available = False
+
+# sounddevice/soundfile are imported by AudioPlayer.__init__ (see _import_audio_backends):
+# loading portaudio/libsndfile is slow, and not every process that imports this module plays audio
+sd = None
+sf = None
 
 # assuming eventbus is around if we need it for events like playback_started/finished
 # from src.event_bus import EventBus
@@ -17,23 +30,352 @@ EVENT_PLAYBACK_STARTED = "playback_started"
 EVENT_PLAYBACK_FINISHED = "playback_finished"
 EVENT_PLAYBACK_ERROR = "playback_error"
 
-from typing import Optional, Dict, Any
+# files smaller than this are decoded fully and kept in memory (bytes on disk)
+DEFAULT_INLINE_THRESHOLD_BYTES = 1024 * 1024
+# total size of decoded float32 audio kept in memory across all cached files
+DEFAULT_DECODED_CACHE_BYTES = 64 * 1024 * 1024
+# queued files warmed in parallel, and how much of the start of each one is read ahead
+DEFAULT_PREFETCH_DEPTH = 4
+DEFAULT_PREFETCH_BYTES = 1024 * 1024
+# adaptive blocksize: underflows in one track that double it, clean tracks in a row that halve it again
+BLOCKSIZE_GROW_UNDERFLOWS = 3
+BLOCKSIZE_SHRINK_AFTER_TRACKS = 10
+BLOCKSIZE_GROW_START = 1024 # first fixed size when growing from 0 (host default)
+MIN_BLOCKSIZE = 256
+MAX_BLOCKSIZE = 8192
+# realtime priority (SCHED_FIFO on linux) requested for the playback and decoder threads
+DEFAULT_RT_PRIORITY = 10
+# audio decoded before a track is handed to the stream callback
+DEFAULT_PREFILL_MS = 80
+# how long the playback loop waits without the callback consuming anything before giving up on the stream
+STREAM_WATCHDOG_SECONDS = 5
+# how long the outputstream stays open with nothing queued before the device is released
+STREAM_IDLE_CLOSE_SECONDS = 60
+
+
+class QueuedTrack(NamedTuple):
+    """a validated queue entry, with the header info parsed when it was queued."""
+    path: str
+    samplerate: int
+    channels: int
+    frames: int
+
+
+def _import_audio_backends():
+    """imports sounddevice and soundfile into the module namespace on first use."""
+    global sd, sf
+    if sd is None:
+        import sounddevice as sd
+    if sf is None:
+        import soundfile as sf
+
+
+def _fill_silence(outdata, start: int):
+    """zeroes a raw output buffer from byte offset start to the end."""
+    np.frombuffer(outdata, dtype=np.uint8)[start:] = 0
+
+
+# (sd.query_devices() result, lowercased output device name -> id), enumerated once per
+# process (see AudioPlayer.refresh_devices). guarded by _DEVICE_CACHE_LOCK.
+_DEVICE_CACHE: Optional[tuple[list, Dict[str, int]]] = None
+_DEVICE_CACHE_LOCK = threading.Lock()
+
+
+def _query_devices_cached() -> tuple[list, Dict[str, int]]:
+    """returns the portaudio device list and output name index, querying the host apis only on first use."""
+    global _DEVICE_CACHE
+    with _DEVICE_CACHE_LOCK:
+        if _DEVICE_CACHE is None:
+            devices = list(sd.query_devices())
+            output_index: Dict[str, int] = {}
+            for i, device in enumerate(devices):
+                if device['max_output_channels'] > 0:
+                    output_index.setdefault(device['name'].lower(), i) # first device wins on duplicate names
+            _DEVICE_CACHE = (devices, output_index)
+        return _DEVICE_CACHE
+
+
+class _DecodedSource:
+    """reads frames from an already decoded array, mimicking the bits of sf.SoundFile the decoder thread uses."""
+
+    def __init__(self, data: np.ndarray, samplerate: int):
+        self._data = data
+        self._pos = 0 # frame cursor into data
+        self.samplerate = samplerate
+        self.channels = data.shape[1]
+
+    def buffer_read_into(self, buffer, dtype: str = 'float32') -> int:
+        """copies as many frames as fit into the raw float32 buffer and returns the number of frames copied."""
+        out = np.frombuffer(buffer, dtype=np.float32)
+        frames = min(out.shape[0] // self.channels, self._data.shape[0] - self._pos)
+        out[:frames * self.channels] = self._data[self._pos:self._pos + frames].reshape(-1) # data is c-contiguous, so this is a view
+        self._pos += frames
+        return frames
+
+    def close(self):
+        pass # nothing to release, the data stays in the decoded cache
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _SequentialFile:
+    """sf.SoundFile on our own descriptor, with posix_fadvise hints for a read-once, front-to-back file.
+
+    SEQUENTIAL widens the kernel's readahead window while the track plays, and DONTNEED
+    drops its pages on close so long playlists don't push more useful data out of the page cache.
+    """
+
+    def __init__(self, file_path: str):
+        self._fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(self._fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            self._file = sf.SoundFile(self._fd, 'r', closefd=False)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def buffer_read_into(self, buffer, dtype: str = 'float32') -> int:
+        return self._file.buffer_read_into(buffer, dtype=dtype)
+
+    def close(self):
+        if self._fd < 0:
+            return
+        self._file.close()
+        try:
+            os.posix_fadvise(self._fd, 0, 0, os.POSIX_FADV_DONTNEED) # played once, free the page cache
+        except OSError:
+            pass
+        os.close(self._fd)
+        self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class _ResampledSource:
+    """wraps a source and converts it to another samplerate with soxr, block by block on the decoder thread.
+
+    the resampler's filter adds a few ms of one-time latency at the start of each track.
+    """
+
+    def __init__(self, source, in_rate: int, out_rate: int, channels: int):
+        self._source = source
+        self._channels = channels
+        self._ratio = out_rate / in_rate
+        self._resampler = soxr.ResampleStream(in_rate, out_rate, channels, dtype='float32', quality='HQ')
+        self._pending = np.empty((0, channels), dtype=np.float32) # resampled frames not handed out yet
+        self._eof = False
+
+    def buffer_read_into(self, buffer, dtype: str = 'float32') -> int:
+        out = np.frombuffer(buffer, dtype=np.float32).reshape(-1, self._channels)
+        wanted = out.shape[0]
+        filled = 0
+        while filled < wanted:
+            if not len(self._pending):
+                if self._eof:
+                    break
+                in_frames = max(int((wanted - filled) / self._ratio) + 1, 1024)
+                chunk = np.empty((in_frames, self._channels), dtype=np.float32)
+                frames_read = self._source.buffer_read_into(chunk, dtype='float32')
+                self._eof = frames_read < in_frames
+                # last=True flushes the filter's tail at the end of the file
+                self._pending = self._resampler.resample_chunk(chunk[:frames_read], last=self._eof)
+                continue
+            n = min(wanted - filled, len(self._pending))
+            out[filled:filled + n] = self._pending[:n]
+            self._pending = self._pending[n:]
+            filled += n
+        return filled
+
+
+class _UpmixedSource:
+    """plays a mono source on a multichannel stream by copying it to every channel."""
+
+    def __init__(self, source, channels: int):
+        self._source = source
+        self._channels = channels
+        self._mono = np.empty(0, dtype=np.float32) # scratch, grown to the largest read
+
+    def buffer_read_into(self, buffer, dtype: str = 'float32') -> int:
+        out = np.frombuffer(buffer, dtype=np.float32).reshape(-1, self._channels)
+        if self._mono.shape[0] < out.shape[0]:
+            self._mono = np.empty(out.shape[0], dtype=np.float32)
+        mono = self._mono[:out.shape[0]]
+        frames_read = self._source.buffer_read_into(mono, dtype='float32')
+        out[:frames_read] = mono[:frames_read, None]
+        return frames_read
+
+
+# size of the per-track ring between the decoder thread and the stream callback
+RING_BUFFER_BYTES = 256 * 1024
+
+
+class _TrackRing:
+    """single-producer/single-consumer ring of raw float32 frames for one track.
+
+    a decoder thread (fill_from) reads the source into the ring and the stream callback
+    (read_into) drains it, so libsndfile is never called from the realtime callback.
+    _head is only advanced by the decoder and _tail only by the callback; plain int stores
+    are atomic under the gil, so neither side takes a lock. the decoder sleeps on _space
+    while less than half of the ring is free, and the callback wakes it.
+    """
+
+    def __init__(self, channels: int, capacity_bytes: int = RING_BUFFER_BYTES):
+        self.channels = channels
+        self._bytes_per_frame = channels * 4 # float32 samples
+        # power-of-two capacity in frames, so positions wrap with a mask
+        self._capacity = 1 << max(capacity_bytes // self._bytes_per_frame, 1).bit_length() - 1
+        self._mask = self._capacity - 1
+        self._buf = np.zeros(self._capacity * self._bytes_per_frame, dtype=np.uint8)
+        self._head = 0 # total frames written
+        self._tail = 0 # total frames read
+        self._space = threading.Event() # set by the callback once half the ring is free again
+        self._closed = False
+        self.eof = False # the decoder reached the end of the source (or failed)
+        self.error: Optional[Exception] = None # decode error, reported by the playback loop
+
+    def reset(self):
+        """empties the ring for the next track. only call while no decoder thread is running."""
+        self._head = 0
+        self._tail = 0
+        self._space.clear()
+        self._closed = False
+        self.eof = False
+        self.error = None
+
+    @property
+    def frames_played(self) -> int:
+        """frames handed to the stream so far."""
+        return self._tail
+
+    @property
+    def drained(self) -> bool:
+        """true once the source is exhausted and every decoded frame was played."""
+        return self.eof and self._head == self._tail
+
+    def prefill(self, source, frames: int):
+        """decodes up to frames frames on the calling thread, before the decoder thread starts."""
+        bpf = self._bytes_per_frame
+        start = self._head & self._mask
+        frames = min(frames, self._capacity - (self._head - self._tail), self._capacity - start)
+        if frames <= 0:
+            return
+        frames_read = source.buffer_read_into(memoryview(self._buf)[start * bpf:(start + frames) * bpf], dtype='float32')
+        self._head += frames_read
+        if frames_read < frames:
+            self.eof = True # whole track fit in the prefill
+
+    def fill_from(self, source):
+        """decoder thread body: reads the source into the ring until eof or close()."""
+        bpf = self._bytes_per_frame
+        half = self._capacity // 2
+        view = memoryview(self._buf)
+        try:
+            while not self._closed and not self.eof:
+                free = self._capacity - (self._head - self._tail)
+                if free < half:
+                    self._space.clear()
+                    # re-check after clearing, so a drain in between can't be missed
+                    if self._capacity - (self._head - self._tail) < half:
+                        self._space.wait()
+                    continue
+                start = self._head & self._mask
+                frames = min(free, self._capacity - start) # contiguous run up to the wrap point
+                frames_read = source.buffer_read_into(view[start * bpf:(start + frames) * bpf], dtype='float32')
+                self._head += frames_read
+                if frames_read < frames:
+                    break # end of file
+        except Exception as e:
+            self.error = e
+        self.eof = True
+
+    def read_into(self, outdata, frames: int) -> int:
+        """callback side: copies up to frames frames into the raw output buffer and returns how many were copied."""
+        bpf = self._bytes_per_frame
+        n = min(frames, self._head - self._tail)
+        start = self._tail & self._mask
+        first = min(n, self._capacity - start)
+        out = np.frombuffer(outdata, dtype=np.uint8)
+        out[:first * bpf] = self._buf[start * bpf:(start + first) * bpf]
+        if n > first: # wrapped around
+            out[first * bpf:n * bpf] = self._buf[:(n - first) * bpf]
+        self._tail += n
+        if not self._space.is_set() and self._capacity - (self._head - self._tail) >= self._capacity // 2:
+            self._space.set()
+        return n
+
+    def close(self):
+        """stops the decoder thread at its next check."""
+        self._closed = True
+        self._space.set()
+
 
 class AudioPlayer:
     """handles audio playback using sounddevice and soundfile."""
 
     def __init__(self, config: Dict[str, Any], event_bus=None): # event_bus is optional for now
+        _import_audio_backends()
         self._config = config
         self._event_bus = event_bus
         self._playback_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._play_queue = queue.Queue() # queue to hold file paths to play
-        self._current_stream: Optional[sd.OutputStream] = None
+        # play queue: single consumer (playback loop), append/popleft are atomic so no extra lock needed
+        self._play_deque: deque[Optional[QueuedTrack]] = deque() # tracks to play, None is the shutdown sentinel
+        self._item_available = threading.Event() # set whenever something is appended to _play_deque
+        # immutable copy of the queued paths for readers, republished under _lock by every writer
+        self._snapshot: Tuple[str, ...] = ()
+        # outputstream shared by consecutive tracks of the same format, guarded by _lock
+        self._current_stream: Optional[sd.RawOutputStream] = None
+        self._stream_format: Optional[tuple[int, int, int]] = None # (samplerate, channels, blocksize) of _current_stream
+        self._bytes_per_frame = 0
+        self._rt_priority_warned = False
+        # what the stream callback reads from. swapped by the playback loop between tracks; the
+        # callback only try-acquires _source_lock and plays silence for a block if it's busy.
+        self._source: Optional[_TrackRing] = None
+        self._source_lock = threading.Lock()
+        self._decoder_thread: Optional[threading.Thread] = None # fills the playing track's ring
+        # filled in by the callback (which can't log), reported by the playback loop per track
+        self._callback_status = sd.CallbackFlags()
+        self._callback_error: Optional[Exception] = None
+        self._underflow_count = 0 # output underflows during the current track, only the callback increments it
+        # frames per callback for new streams, starts at the configured value and adapts to underruns
+        self._configured_blocksize = self._config.get("blocksize", 0)
+        self._blocksize = self._configured_blocksize
+        self._adaptive_blocksize = self._config.get("adaptive_blocksize", True)
+        self._clean_tracks = 0 # tracks in a row without underflows
+        self._track_done = threading.Event() # reused for every track, cleared before each one
+        self._current_done: Optional[threading.Event] = None # _track_done while a track plays, set by stop too
+        self._ring: Optional[_TrackRing] = None # reused across tracks with the same channel count
         self._lock = threading.Lock() # lock to protect shared stuff like _current_stream
+        # tracks queued or playing, guarded by _lock. _idle (on the same lock) is notified when it drops to 0
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
         self._target_device_id: Optional[int] = None # store the target device id
+        # lru cache of small decoded files: path -> (mtime_ns, samplerate, data), guarded by _lock
+        self._decoded_cache: OrderedDict[str, tuple[int, int, np.ndarray]] = OrderedDict()
+        self._decoded_cache_bytes = 0
+        self._inline_threshold = self._config.get("inline_threshold_bytes", DEFAULT_INLINE_THRESHOLD_BYTES)
+        self._decoded_cache_budget = self._config.get("decoded_cache_bytes", DEFAULT_DECODED_CACHE_BYTES)
+        # next queued file opened ahead of time: (path, future of its source), guarded by _lock
+        self._prefetched: Optional[tuple[str, Future]] = None
+        # set by play_file (under _lock) when it wakes a playing track's wait to have the next file prefetched
+        self._prefetch_requested = False
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AudioPrefetch")
+        # reads the start of newly queued files into the page cache, several at once
+        self._prefetch_bytes = self._config.get("prefetch_bytes", DEFAULT_PREFETCH_BYTES)
+        self._warm_executor = ThreadPoolExecutor(max_workers=self._config.get("prefetch_depth", DEFAULT_PREFETCH_DEPTH), thread_name_prefix="AudioWarm")
 
         # find the target device before starting the thread
         self._target_device_id = self._find_output_device_id()
+        self._device_samplerate = self._find_device_samplerate()
 
         # start the playback thread
         self._start_playback_thread()
@@ -48,19 +390,123 @@ class AudioPlayer:
 
         logger.info(f"searching for output device containing: '{device_substring}'")
         try:
-            devices = sd.query_devices()
-            logger.debug(f"available devices: {devices}")
-            for i, device in enumerate(devices):
-                # check if it's an output device (max_output_channels > 0) and name matches substring
-                if device['max_output_channels'] > 0 and device_substring.lower() in device['name'].lower():
-                    logger.info(f"found matching output device: id={i}, name='{device['name']}'")
-                    return i
+            devices, output_index = _query_devices_cached()
+            logger.debug("available devices: %s", devices) # lazy, the list is only formatted at debug level
+            # output devices only, in device order, names already lowercased
+            needle = device_substring.lower()
+            device_id = next((i for name, i in output_index.items() if needle in name), None)
+            if device_id is not None:
+                logger.info(f"found matching output device: id={device_id}, name='{devices[device_id]['name']}'")
+                return device_id
             logger.error(f"could not find an output device matching substring: '{device_substring}'. using default device.")
             return None # fallback to default if not found
         except Exception as e:
             logger.error(f"error querying audio devices: {e}. using default device.", exc_info=True)
             return None
 
+    def _find_device_samplerate(self) -> Optional[int]:
+        """returns the output device's native samplerate if tracks should be resampled to it, else none."""
+        if not self._config.get("resample_to_device", True):
+            return None
+        if not _soxr_available:
+            logger.debug("soxr not installed, leaving samplerate conversion to portaudio.")
+            return None
+        try:
+            if self._target_device_id is not None:
+                device = _query_devices_cached()[0][self._target_device_id]
+            else:
+                device = sd.query_devices(kind='output') # default output device
+            return int(device['default_samplerate'])
+        except Exception as e:
+            logger.warning(f"could not determine the output device samplerate, not resampling: {e}")
+            return None
+
+    def _open_source(self, file_path: str):
+        """opens a file for playback, serving small files from the decoded cache."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            st = None # let soundfile raise a proper error below
+        if st is None or st.st_size >= self._inline_threshold:
+            # large file: stream it from disk
+            if st is not None and hasattr(os, "posix_fadvise"):
+                return _SequentialFile(file_path)
+            return sf.SoundFile(file_path, 'r')
+
+        with self._lock:
+            cached = self._decoded_cache.get(file_path)
+            if cached and cached[0] == st.st_mtime_ns:
+                self._decoded_cache.move_to_end(file_path) # mark as most recently used
+                logger.debug("decoded cache hit for %s", file_path)
+                return _DecodedSource(cached[2], cached[1])
+
+        data, samplerate = sf.read(file_path, dtype='float32', always_2d=True)
+        with self._lock:
+            old = self._decoded_cache.pop(file_path, None)
+            if old:
+                self._decoded_cache_bytes -= old[2].nbytes
+            self._decoded_cache[file_path] = (st.st_mtime_ns, samplerate, data)
+            self._decoded_cache_bytes += data.nbytes
+            # evict least recently used entries until we're back under budget
+            while self._decoded_cache_bytes > self._decoded_cache_budget and len(self._decoded_cache) > 1:
+                evicted_path, evicted = self._decoded_cache.popitem(last=False)
+                self._decoded_cache_bytes -= evicted[2].nbytes
+                logger.debug("evicted %s from decoded cache", evicted_path)
+        return _DecodedSource(data, samplerate)
+
+    def _prefetch_next(self):
+        """opens the next queued file in the background so the track change doesn't wait on open().
+
+        only called on the playback thread, so the head of the queue can't be popped under it.
+        """
+        try:
+            next_track = self._play_deque[0]
+        except IndexError:
+            return # nothing queued
+        if next_track is None:
+            return # shutdown sentinel
+        next_path = next_track.path
+        with self._lock:
+            if self._prefetched and self._prefetched[0] == next_path:
+                return # already opened
+            stale = self._prefetched
+            self._prefetched = (next_path, self._prefetch_executor.submit(self._open_source, next_path))
+        if stale:
+            self._discard_prefetched(stale[1])
+        logger.debug("prefetching next track: %s", next_path)
+
+    def _take_prefetched(self, file_path: str):
+        """returns the prefetched source for file_path, or none if it wasn't (successfully) prefetched."""
+        with self._lock:
+            prefetched, self._prefetched = self._prefetched, None
+        if not prefetched:
+            return None
+        path, future = prefetched
+        if path != file_path: # queue changed since (clear, skip...), throw it away
+            self._discard_prefetched(future)
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            # opening it again in the playback loop reports the error properly
+            logger.debug("prefetch of %s failed: %s", file_path, e)
+            return None
+
+    @staticmethod
+    def _discard_prefetched(future: Future):
+        """closes a prefetched source once its open has finished."""
+        def close_source(done: Future):
+            if not done.cancelled() and done.exception() is None:
+                done.result().close()
+        future.add_done_callback(close_source)
+
+    @classmethod
+    def refresh_devices(cls):
+        """forgets the cached device list so the next lookup re-enumerates (e.g. after hot-plugging a device)."""
+        global _DEVICE_CACHE
+        with _DEVICE_CACHE_LOCK:
+            _DEVICE_CACHE = None
+        logger.info("audio device cache invalidated.")
 
     def _start_playback_thread(self):
         """starts the background thread that processes the play queue."""
@@ -72,9 +518,55 @@ class AudioPlayer:
         self._playback_thread.start()
         logger.info("audio playback thread started.")
 
+    def _raise_thread_priority(self):
+        """best effort: move the calling audio thread (playback loop, decoder) to a realtime scheduling class.
+
+        the priority comes from the rt_priority config key, 0 turns this off. without the
+        needed privileges (CAP_SYS_NICE on linux) it warns once and carries on at normal priority.
+        """
+        priority = self._config.get("rt_priority", DEFAULT_RT_PRIORITY)
+        if hasattr(os, "sched_setscheduler"): # linux
+            if priority > 0:
+                try:
+                    # pid 0 is the calling thread on linux
+                    os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+                    logger.debug("%s scheduling set to SCHED_FIFO %s.", threading.current_thread().name, priority)
+                except (PermissionError, AttributeError, OSError) as e:
+                    self._warn_rt_priority(e)
+            cpu = self._config.get("audio_cpu_affinity")
+            if cpu is not None:
+                try:
+                    os.sched_setaffinity(0, {cpu})
+                    logger.debug("%s pinned to cpu %s.", threading.current_thread().name, cpu)
+                except (AttributeError, OSError) as e:
+                    logger.warning("could not pin audio thread to cpu %s: %s", cpu, e)
+        elif os.name == "nt" and priority > 0:
+            try:
+                import ctypes
+                THREAD_PRIORITY_TIME_CRITICAL = 15
+                kernel32 = ctypes.windll.kernel32
+                if kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL):
+                    logger.debug("%s priority set to time critical.", threading.current_thread().name)
+            except (AttributeError, OSError) as e:
+                self._warn_rt_priority(e)
+
+    def _warn_rt_priority(self, error: Exception):
+        """logs a failed priority change once per player instead of once per track."""
+        if self._rt_priority_warned:
+            logger.debug("could not raise audio thread priority: %s", error)
+            return
+        self._rt_priority_warned = True
+        logger.warning("could not raise audio thread priority, playing at normal priority: %s", error)
+
+    def _decode_track(self, ring: "_TrackRing", source):
+        """decoder thread body: same priority as the playback loop, then fill the ring."""
+        self._raise_thread_priority()
+        ring.fill_from(source)
+
     def _playback_loop(self):
         """the main loop for the playback thread."""
         logger.info("playback loop starting.") # log thread start
+        self._raise_thread_priority()
         while True: # loop forever until shutdown signal (none)
             # --- make sure stop event is clear at the start ---
             self._stop_event.clear()
@@ -82,156 +574,143 @@ class AudioPlayer:
 
             # --- check for shutdown signal first ---
             # check queue for none first, 'cause stop_event might be set for skip/stop
-            # file_path = self._play_queue.get(block=True) # wait forever for an item or none
 
             try:
-                # wait for a file path in the queue (with timeout so we can check stop_event)
-                file_path = self._play_queue.get(timeout=0.5)
-            except queue.Empty:
-                # no item in queue, just keep waiting.
+                track = self._play_deque.popleft()
+            except IndexError:
+                # no item in queue, wait for play_file to signal one.
                 # don't check _stop_event here, skip/stop shouldn't kill the thread.
-                continue # no file to play, loop again
-
-            if file_path is None: # sentinel value for shutdown
+                self._item_available.clear()
+                if not self._play_deque: # re-check after clearing so a concurrent append can't be missed
+                    if self._current_stream is not None:
+                        # keep the stream open for the next request, and only release the device
+                        # once nothing has been queued for a while
+                        if not self._item_available.wait(timeout=STREAM_IDLE_CLOSE_SECONDS):
+                            self._close_stream()
+                    else:
+                        # no timeout: play_file and shutdown() (sentinel) always set the event
+                        self._item_available.wait()
+                continue # loop again and try to pop
+
+            if track is None: # sentinel value for shutdown
                 logger.info("shutdown sentinel (none) received in queue.")
                 break # exit the main while loop
+            self._publish_snapshot()
+            file_path = track.path
 
             # --- check stop event again after getting an item ---
             # this handles if stop/skip was called *while* waiting for get()
             if self._stop_event.is_set():
                  logger.info(f"stop/skip event detected immediately after getting {file_path} from queue. skipping playback.")
-                 self._play_queue.task_done() # mark item as done even though skipped
+                 self._track_processed()
                  # event gets cleared at the start of the next loop
                  continue # go to next loop iteration
 
 
             logger.info(f"attempting to start playback for: {file_path}") # changed log message slightly
-            # --- load audio data ---
-            # We actually don't need to preload data if using the callback with sf.SoundFile
-            # try:
-            #     data, samplerate = sf.read(file_path, dtype='float32')
-            #     logger.debug(f"loaded audio file: {file_path}, samplerate: {samplerate}, shape: {data.shape}")
-            # except sf.SoundFileError as e:
-            #     logger.error(f"soundfileerror loading {file_path}: {e}")
-            #     if self._event_bus: self._event_bus.publish(EVENT_PLAYBACK_ERROR, file_path=file_path, error=str(e))
-            #     self._play_queue.task_done() # mark as done even on load failure
-            #     continue # skip to next item in queue
-            # except Exception as e:
-            #     logger.error(f"unexpected error loading audio file {file_path}: {e}", exc_info=True)
-            #     if self._event_bus: self._event_bus.publish(EVENT_PLAYBACK_ERROR, file_path=file_path, error=str(e))
-            #     self._play_queue.task_done()
-            #     continue
-
-            # --- play audio using outputstream and callback ---
-            stream = None # define stream variable outside try
+
+            # --- play audio through the shared outputstream ---
+            # large files are streamed block by block by a decoder thread, small ones are
+            # decoded once and replayed from memory. opening the source is also the
+            # validation step: a missing or undecodable file raises sf.SoundFileError,
+            # handled below with EVENT_PLAYBACK_ERROR.
+            stream_failed = False
+            playback_interrupted = False
             try:
-                # use soundfile to open the file for reading in the callback
-                with sf.SoundFile(file_path, 'r') as audio_file:
-                    samplerate = audio_file.samplerate
-                    channels = audio_file.channels
-                    logger.debug(f"opened audio file: {file_path}, samplerate: {samplerate}, channels: {channels}")
-
-                    # event to signal when callback is done or errored
-                    stream_finished_event = threading.Event()
-                    # buffer size (frames per callback)
-                    blocksize = 1024 # adjust as needed
-
-                    def callback(outdata: memoryview, frames: int, time_info, status: sd.CallbackFlags):
-                        """callback function to feed audio data to the stream."""
-                        if status:
-                            logger.warning(f"playback status flags: {status}")
-                            # You might want to signal an error or stop based on the status
-                            # For example: if status.output_underflow: stream_finished_event.set()
-
-                        try:
-                            # read requested number of frames from the file
-                            read_data = audio_file.read(frames, dtype='float32', always_2d=True)
-                            frames_read = read_data.shape[0]
-
-                            if frames_read == 0: # end of file reached immediately
-                                logger.debug("callback: end of file reached (0 frames read).")
-                                outdata[:] = 0 # fill buffer with silence
-                                raise sd.CallbackStop # signal stream to stop
-                            else:
-                                # copy the read data into the output buffer slice
-                                outdata[:frames_read] = read_data
-
-                                if frames_read < frames: # end of file reached in this read
-                                    logger.debug(f"callback: padding end of stream ({frames_read}/{frames} frames).")
-                                    # zero out the remaining part of the buffer
-                                    outdata[frames_read:] = 0
-                                    raise sd.CallbackStop # signal stream to stop after this buffer
-
-                        except Exception as e:
-                            logger.error(f"error within audio callback for {file_path}: {e}", exc_info=True)
-                            # Signal completion/error to the main thread
-                            stream_finished_event.set()
-                            raise sd.CallbackAbort # Abort stream on unexpected error in callback
-
-
-                    def finished_callback():
-                        """called when the stream finishes normally or is stopped/aborted."""
-                        logger.debug(f"stream finished_callback invoked for {file_path}")
-                        stream_finished_event.set() # signal completion/stop
-
-                    logger.debug(f"attempting to create outputstream for device id: {self._target_device_id}")
-                    # create and start the outputstream, specifying the device
-                    stream = sd.OutputStream(
-                        device=self._target_device_id, # use the found device id (or none for default)
-                        samplerate=samplerate,
-                        channels=channels,
-                        blocksize=blocksize, # use specified blocksize
-                        callback=callback,
-                        finished_callback=finished_callback
-                    )
-                    logger.debug(f"outputstream created. attempting to start stream...")
-                    with self._lock: # protect stream variable during start/stop
-                         self._current_stream = stream # store ref for stop_playback
-                         stream.start() # this call might block/hang
-                         logger.debug(f"outputstream started successfully for {file_path}")
-
-                    # wait for the stream to finish (signaled by finished_callback or stop_event)
-                    playback_interrupted = False # flag to track if stopped early
-                    while not stream_finished_event.wait(timeout=0.1):
-                         if self._stop_event.is_set():
-                              logger.info(f"stop requested during playback of {file_path}. stopping stream and breaking wait loop.")
-                              playback_interrupted = True
-                              # --- try stopping the stream directly here ---
-                              try:
-                                  # use the lock for safe access to stream object
-                                  with self._lock:
-                                      # check if it's still the current stream and not already stopped
-                                      if self._current_stream == stream and stream and not stream.stopped:
-                                          logger.debug("attempting to stop stream directly from wait loop...")
-                                          stream.stop() # stop it now
-                                          logger.debug("stream stopped directly from wait loop.")
-                              except Exception as e_stop:
-                                  logger.error(f"error stopping stream directly within wait loop: {e_stop}", exc_info=True)
-                              # --- end direct stop attempt ---
-                              break # break the wait loop
-
-                    # --- cleanup after playback/stop ---
-                    # make sure stream is stopped and closed if it exists
+                audio_file = self._take_prefetched(file_path)
+                if audio_file is None: # not "or": a soundfile with no frames is falsy, and would leak the prefetched handle
+                    audio_file = self._open_source(file_path)
+                with audio_file:
+                    # format was parsed by play_file when the track was queued
+                    samplerate = track.samplerate
+                    channels = track.channels
+                    logger.debug("opened audio file: %s, samplerate: %s, channels: %s", file_path, samplerate, channels)
+
+                    # convert to the device's native rate here, once, rather than per callback in portaudio
+                    source = audio_file
+                    if self._device_samplerate and samplerate != self._device_samplerate:
+                        logger.debug("resampling %s from %s to %s hz", file_path, samplerate, self._device_samplerate)
+                        source = _ResampledSource(audio_file, samplerate, self._device_samplerate, channels)
+                        samplerate = self._device_samplerate
+                    # a mono track can play on the open multichannel stream instead of reopening it
+                    open_format = self._stream_format # only this thread changes it
+                    if channels == 1 and open_format and open_format[1] > 1 and open_format[0] == samplerate and open_format[2] == self._blocksize:
+                        source = _UpmixedSource(source, open_format[1])
+                        channels = open_format[1]
+
+                    # buffer size (frames per callback). 0 lets portaudio pick the host api's
+                    # native period, which is far less prone to underruns than a small fixed size.
+                    # _tune_blocksize may have grown it after underruns.
+                    stream = self._ensure_stream(samplerate, channels, self._blocksize)
+
+                    # event to signal when the callback ran out of data, stop_playback sets it too
+                    track_done = self._track_done
+                    track_done.clear()
+                    self._callback_status = sd.CallbackFlags()
+                    self._underflow_count = 0
+                    self._callback_error = None
                     with self._lock:
-                        if self._current_stream == stream and stream: # check if it's still the same stream
-                            if not stream.stopped:
-                                try: stream.stop()
-                                except sd.PortAudioError as pae: logger.warning(f"Ignoring PortAudioError on stop: {pae}")
-                            if not stream.closed:
-                                try: stream.close()
-                                except sd.PortAudioError as pae: logger.warning(f"Ignoring PortAudioError on close: {pae}")
-                            self._current_stream = None # clear reference
-                            logger.debug(f"stream stopped and closed for {file_path}")
-
-                    # log normal finish only if stop wasn't requested and stream finished naturally
-                    if not playback_interrupted and stream_finished_event.is_set():
+                        self._current_done = track_done # lets stop_playback wake the wait below
+                        self._prefetch_requested = False # the _prefetch_next below covers anything queued so far
+
+                    # decode on a separate thread into a ring the callback drains. the first
+                    # prefill_ms are decoded right here, so the stream never starts on an empty ring.
+                    ring = self._ring
+                    if ring is None or ring.channels != channels:
+                        ring = self._ring = _TrackRing(channels)
+                    else:
+                        ring.reset() # the previous track's decoder has been joined
+                    ring.prefill(source, samplerate * self._config.get("prefill_ms", DEFAULT_PREFILL_MS) // 1000)
+                    self._decoder_thread = threading.Thread(target=self._decode_track, args=(ring, source), name="AudioDecoder", daemon=True)
+                    self._decoder_thread.start()
+                    try:
+                        with self._source_lock:
+                            self._source = ring # the callback picks it up on its next block
+                        if stream.stopped:
+                            stream.start() # new stream
+                            logger.debug("outputstream started successfully for %s", file_path)
+                        if self._stop_event.is_set():
+                            track_done.set() # stop arrived before stop_playback could see _current_done
+                        self._prefetch_next() # open the next track while this one plays
+
+                        # sleep until the file runs out or stop_playback wakes us (play_file wakes us too,
+                        # just to prefetch what it queued). the timeout is only
+                        # a watchdog for a stream whose callback stopped running (e.g. device unplugged
+                        # without portaudio calling finished_callback).
+                        frames_played = ring.frames_played
+                        while True:
+                            if track_done.wait(timeout=STREAM_WATCHDOG_SECONDS):
+                                if not self._take_prefetch_request(ring, stream):
+                                    break # end of file, stop/skip, or the stream went away
+                                self._prefetch_next() # play_file queued something while this track plays
+                                continue
+                            if stream.active and ring.frames_played != frames_played:
+                                frames_played = ring.frames_played
+                                continue # still making progress
+                            raise sd.PortAudioError(f"output stream stalled for {STREAM_WATCHDOG_SECONDS} s")
+                    finally:
+                        self._stop_decoder(ring) # detaches the track and joins the decoder before the file gets closed
+                    playback_interrupted = self._stop_event.is_set() # woken by stop/skip rather than end of file
+                    if playback_interrupted:
+                        # _stop_decoder already detached the track, so the callback plays silence now.
+                        # on a skip the stream keeps running for the next track and only a few ms of
+                        # already-buffered audio are still heard; after !stop it's aborted below.
+                        logger.info("stop requested during playback of %s. dropped the rest of the track.", file_path)
+
+                    # report what the realtime callback couldn't log itself
+                    if self._callback_status:
+                        logger.warning("playback status flags for %s: %s", file_path, self._callback_status)
+                    if self._callback_error:
+                        logger.error("error within audio callback for %s: %s", file_path, self._callback_error, exc_info=self._callback_error)
+                    if ring.error:
+                        logger.error("error decoding %s: %s", file_path, ring.error, exc_info=ring.error)
+                    self._tune_blocksize(self._underflow_count)
+
+                    if playback_interrupted:
+                        logger.info(f"playback interrupted for: {file_path}")
+                    else:
                         logger.info(f"finished playback for: {file_path}")
                         if self._event_bus: self._event_bus.publish(EVENT_PLAYBACK_FINISHED, file_path=file_path)
-                    elif playback_interrupted:
-                        logger.info(f"playback interrupted for: {file_path}")
-                        # don't clear the event here anymore. it's cleared at the start of the loop.
-                        # self._stop_event.clear()
-                        # logger.debug("stop event cleared after handling interruption.")
 
 
             except sf.SoundFileError as e:
@@ -240,39 +719,227 @@ class AudioPlayer:
             except sd.PortAudioError as e:
                 logger.error(f"portaudioerror during playback setup for {file_path}: {e}", exc_info=True) # added exc_info
                 if self._event_bus: self._event_bus.publish(EVENT_PLAYBACK_ERROR, file_path=file_path, error=str(e))
+                stream_failed = True # don't reuse a stream that may be broken
             except Exception as e:
                 logger.error(f"unexpected error during playback processing of {file_path}: {e}", exc_info=True) # changed log message
                 if self._event_bus: self._event_bus.publish(EVENT_PLAYBACK_ERROR, file_path=file_path, error=str(e))
+                stream_failed = True
             finally:
-                # ensure stream is cleaned up even if errors occurred before the main wait loop
                 with self._lock:
-                    if self._current_stream == stream and stream and not stream.closed:
-                        try:
-                            if not stream.stopped: stream.stop()
-                            stream.close()
-                            self._current_stream = None
-                            logger.debug(f"stream cleaned up in finally block for {file_path}")
-                        except sd.PortAudioError as pae:
-                            logger.warning(f"Ignoring PortAudioError during finally cleanup: {pae}")
-                        except Exception as final_e:
-                             logger.error(f"Error during final stream cleanup for {file_path}: {final_e}")
-
-                # mark task as done regardless of success/failure
-                logger.debug(f"marking task done for {file_path} in finally block.")
-                self._play_queue.task_done()
-
-
+                    self._current_done = None
+                # after a natural end the stream keeps running (playing silence) for the next track,
+                # queued or not; the idle wait above releases it. a failed stream is torn down, and so
+                # is the stream after !stop, aborted so the tail portaudio still has buffered isn't heard.
+                if stream_failed or (playback_interrupted and not self._play_deque):
+                    self._close_stream(abort=True)
+                self._track_processed()
+
+        self._close_stream(abort=True) # shutting down, nothing left worth playing out
         logger.warning("audio playback thread loop exited.") # changed level to warning
 
-
-    def play_file(self, file_path: str):
-        """adds a file path to the playback queue."""
+    def _take_prefetch_request(self, ring: "_TrackRing", stream: "sd.RawOutputStream") -> bool:
+        """returns true if the playing track's wait was only woken by play_file, with _track_done cleared again."""
+        with self._lock:
+            requested, self._prefetch_requested = self._prefetch_requested, False
+        if not requested:
+            return False
+        self._track_done.clear()
+        # whatever really ends the track either sets _track_done again after this, or is visible here
+        if self._stop_event.is_set() or self._source is not ring or not stream.active:
+            self._track_done.set()
+            return False
+        return True
+
+    def _tune_blocksize(self, underflows: int):
+        """grows the blocksize after a track with repeated underruns, and shrinks it back after a run of clean tracks.
+
+        the new size only takes effect when the next stream is created (_ensure_stream compares it).
+        """
+        if not self._adaptive_blocksize:
+            return
+        old = self._blocksize
+        if underflows >= BLOCKSIZE_GROW_UNDERFLOWS:
+            self._clean_tracks = 0
+            # 0 (host default) has no size to double, start from a generous fixed one
+            self._blocksize = min(self._blocksize * 2, MAX_BLOCKSIZE) if self._blocksize else BLOCKSIZE_GROW_START
+        elif underflows == 0 and self._blocksize != self._configured_blocksize:
+            self._clean_tracks += 1
+            if self._clean_tracks >= BLOCKSIZE_SHRINK_AFTER_TRACKS:
+                self._clean_tracks = 0
+                smaller = self._blocksize // 2
+                # back to the configured size once halving would drop below it (or the floor)
+                if smaller < max(self._configured_blocksize, MIN_BLOCKSIZE):
+                    smaller = self._configured_blocksize
+                self._blocksize = smaller
+        if self._blocksize != old:
+            logger.info("blocksize changed from %s to %s after %s underflows in the last track.", old, self._blocksize, underflows)
+
+    def _track_processed(self, count: int = 1):
+        """marks count tracks as done (played, skipped, failed or cleared) and wakes wait_until_idle."""
+        with self._idle:
+            self._pending -= count
+            if self._pending <= 0:
+                self._pending = 0
+                self._idle.notify_all()
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """blocks until every queued track has been processed. returns false on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def _stop_decoder(self, ring: _TrackRing):
+        """stops the decoder thread filling ring and waits for it, so its source can be closed."""
+        with self._source_lock:
+            self._source = None
+        ring.close()
+        if self._decoder_thread is not None:
+            self._decoder_thread.join()
+            self._decoder_thread = None
+
+    def _ensure_stream(self, samplerate: int, channels: int, blocksize: int) -> "sd.RawOutputStream":
+        """returns the open outputstream if it matches the format, otherwise replaces it with a new one."""
+        stream_format = (samplerate, channels, blocksize)
+        stream = self._current_stream
+        if stream is not None and not stream.closed and self._stream_format == stream_format:
+            logger.debug("reusing outputstream for format %s", stream_format)
+            return stream # same format as the last track, keep the device open
+
+        self._close_stream()
+        logger.debug("attempting to create outputstream for device id: %s", self._target_device_id)
+        # the raw variant hands the callback portaudio's buffer directly instead of wrapping it in an ndarray
+        stream = sd.RawOutputStream(
+            device=self._target_device_id, # use the found device id (or none for default)
+            samplerate=samplerate,
+            channels=channels,
+            dtype='float32',
+            blocksize=blocksize, # use specified blocksize
+            callback=self._stream_callback,
+            finished_callback=self._stream_finished
+        )
+        self._bytes_per_frame = channels * 4 # float32 samples
+        with self._lock:
+            self._current_stream = stream
+            self._stream_format = stream_format
+        logger.debug("outputstream created for format %s", stream_format)
+        return stream
+
+    def _close_stream(self, abort: bool = False):
+        """stops and closes the current outputstream, if any. abort drops what portaudio still has buffered instead of playing it out."""
+        # only claim the stream under the lock; the portaudio teardown itself runs
+        # outside it so stop_playback/get_queue_snapshot never wait on it
+        with self._lock:
+            stream = self._current_stream
+            self._current_stream = None # clear reference
+            self._stream_format = None
+        if stream is None:
+            return
+        try:
+            # a stream that died or never started is already stopped, skip the round-trip
+            if not stream.stopped:
+                if abort:
+                    stream.abort()
+                else:
+                    stream.stop()
+        except sd.PortAudioError as pae:
+            logger.warning(f"Ignoring PortAudioError on stop: {pae}")
+        finally:
+            if not stream.closed:
+                try: stream.close()
+                except sd.PortAudioError as pae: logger.warning(f"Ignoring PortAudioError on close: {pae}")
+        logger.debug("outputstream stopped and closed.")
+
+    def _stream_callback(self, outdata, frames: int, time_info, status: "sd.CallbackFlags"):
+        """feeds the current track to portaudio. runs on the realtime thread, so it never logs or blocks."""
+        if status:
+            self._callback_status |= status # accumulate underflow etc. flags, reported per track
+            if status.output_underflow:
+                self._underflow_count += 1
+        if not self._source_lock.acquire(blocking=False):
+            _fill_silence(outdata, 0) # the playback loop is swapping tracks right now, skip one block
+            return
+        try:
+            source = self._source
+            frames_read = 0
+            if source is not None:
+                try:
+                    # only a copy out of the decoder's ring, no libsndfile calls here
+                    frames_read = source.read_into(outdata, frames)
+                except Exception as e:
+                    self._callback_error = e
+                    source.close()
+                    source.eof = True
+            if frames_read < frames:
+                _fill_silence(outdata, frames_read * self._bytes_per_frame) # pad with silence
+                if source is not None and (source.drained or source.error or self._callback_error):
+                    # end of file: detach the source and wake the playback loop. the stream keeps
+                    # running so the next track of the same format can follow without reopening it.
+                    # a short read before that is a decoder underrun and just plays silence.
+                    self._source = None
+                    done = self._current_done
+                    if done:
+                        done.set()
+        finally:
+            self._source_lock.release()
+
+    def _stream_finished(self):
+        """called by portaudio when the stream stops, aborts or dies; wakes a playback loop that is still waiting."""
+        done = self._current_done
+        if done:
+            done.set()
+
+
+    def play_file(self, file_path: str) -> bool:
+        """validates a file and adds it to the playback queue. returns false if it can't be played."""
         if not isinstance(file_path, str) or not file_path:
              logger.error("invalid file path provided for playback.")
-             return
-        # basic check, ideally validate existence/permissions here or in playback loop
+             return False
+        # validate here, in the caller's thread, instead of failing later in the playback thread
+        if not os.path.isfile(file_path):
+            logger.error(f"cannot queue {file_path}: file not found.")
+            return False
+        try:
+            info = sf.info(file_path) # cheap header parse
+        except Exception as e:
+            logger.error(f"cannot queue {file_path}: not a readable audio file ({e}).")
+            return False
+
         logger.info(f"queueing file for playback: {file_path}")
-        self._play_queue.put(file_path)
+        with self._lock:
+            self._pending += 1 # before the append, so the playback loop can't finish it first
+        self._warm_executor.submit(self._prewarm_file, file_path) # don't block the caller on disk reads
+        self._play_deque.append(QueuedTrack(file_path, info.samplerate, info.channels, info.frames))
+        self._publish_snapshot()
+        self._item_available.set()
+        with self._lock:
+            if self._current_done is not None: # a track is playing, have the playback thread prefetch this one
+                self._prefetch_requested = True
+                self._current_done.set()
+        return True
+
+    def _prewarm_file(self, file_path: str):
+        """pulls the start of a queued file into the page cache so the playback thread doesn't stall on disk.
+
+        runs on the warm pool, so the files queued after it are read concurrently instead of
+        one by one at track changes.
+        """
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED) # async readahead of the whole file
+                # read the head for real (this is all we get on windows/macos); the data is
+                # dropped, opening the file later is served from the page cache
+                remaining = self._prefetch_bytes
+                while remaining > 0:
+                    chunk = os.read(fd, min(remaining, 256 * 1024))
+                    if not chunk:
+                        break # file is shorter
+                    remaining -= len(chunk)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            # not fatal, the playback loop reports missing/unreadable files itself
+            logger.debug("could not prewarm %s: %s", file_path, e)
 
     def stop_playback(self, clear_queue: bool = False): # default clear_queue to false
         """signals the playback thread to stop the current track. optionally clears the queue."""
@@ -282,30 +949,41 @@ class AudioPlayer:
         # set the event. the playback loop's wait() will detect this.
         # the loop itself is responsible for stopping/closing the stream.
         self._stop_event.set()
+        with self._lock:
+            if self._current_done:
+                self._current_done.set() # wake the playback loop immediately
         logger.debug("stop event set.")
         # --- end signal ---
 
         # clear the queue if requested (can still do this right away)
         if clear_queue:
             logger.debug("clearing playback queue...")
-            while not self._play_queue.empty():
+            cleared = 0
+            while True: # popleft one by one (each is atomic) so we know exactly what we removed
                 try:
-                    self._play_queue.get_nowait()
-                    self._play_queue.task_done()
-                except queue.Empty:
+                    track = self._play_deque.popleft()
+                except IndexError:
                     break
-                except Exception as e:
-                     logger.error(f"error clearing item from queue: {e}")
+                if track is not None:
+                    cleared += 1
+            if cleared:
+                self._publish_snapshot()
+                self._track_processed(cleared)
             logger.info("playback queue cleared.")
 
         # don't clear the stop event here. the playback loop handles it.
         # self._stop_event.clear() # ensure this line is removed or commented out
         # logger.debug("stop event cleared, playback loop can continue.") # ensure this is removed or commented out
 
-    def get_queue_snapshot(self) -> List[str]:
-        """returns a copy of the current items in the playback queue."""
-        with self._play_queue.mutex: # access underlying queue safely
-            return list(self._play_queue.queue)
+    def _publish_snapshot(self):
+        """rebuilds the queue snapshot after the deque changed."""
+        # under the lock so two writers can't publish out of order and leave a stale tuple behind
+        with self._lock:
+            self._snapshot = tuple(track.path for track in list(self._play_deque) if track)
+
+    def get_queue_snapshot(self) -> Tuple[str, ...]:
+        """returns the paths currently in the playback queue. lock-free, the tuple is never mutated."""
+        return self._snapshot
 
     def get_output_device_id(self) -> Optional[int]:
         """returns the configured output device id (or none if default)."""
@@ -317,13 +995,22 @@ class AudioPlayer:
         logger.info("audioplayer shutting down...")
         self.stop_playback(clear_queue=True) # stop current sound and clear queue
         self._stop_event.set() # signal the playback loop thread to exit
-        self._play_queue.put(None) # add sentinel value to unblock queue.get()
+        self._play_deque.append(None) # add sentinel value so the loop exits
+        self._item_available.set() # and wake it if it's waiting for an item
 
+        if not self.wait_until_idle(timeout=2): # current track winding down
+            logger.warning("playback did not go idle before shutdown.")
         if self._playback_thread and self._playback_thread.is_alive():
             logger.debug("waiting for playback thread to finish...")
             self._playback_thread.join(timeout=2) # wait for the thread
             if self._playback_thread.is_alive():
                  logger.warning("playback thread did not shut down gracefully.")
+        with self._lock:
+            prefetched, self._prefetched = self._prefetched, None
+        if prefetched:
+            self._discard_prefetched(prefetched[1])
+        self._prefetch_executor.shutdown(wait=False)
+        self._warm_executor.shutdown(wait=False, cancel_futures=True)
         logger.info("audioplayer shut down complete.")
 
 
@@ -334,6 +1021,7 @@ if __name__ == '__main__':
     # create a dummy audio file for testing (requires numpy)
     try:
         import numpy as np
+        import soundfile as sf
         samplerate = 44100
         duration = 3 # seconds
         frequency = 440 # hz (a4 note)
@@ -375,7 +1063,7 @@ if __name__ == '__main__':
 
         print("waiting for playback to finish naturally...")
         # wait until queue is processed
-        player._play_queue.join()
+        player.wait_until_idle()
         print("queue processed.")
 
     else:
@@ -1,5 +1,6 @@
 import logging
-from typing import Callable, Dict, List, Optional, Any
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Any
 
 # assuming eventbus is accessible
 from src.event_bus import EventBus
@@ -13,33 +14,48 @@ CommandCallable = Callable[[Dict[str, Any], List[str]], None]
 
 class Command:
     """represents a registered command."""
+    # no per-instance __dict__; execute is a slot because the enabled setter rebinds it
+    __slots__ = ('name', 'func', 'help_text', 'aliases', 'admin_only', 'source', '_enabled', 'execute')
+
     def __init__(self, name: str, func: CommandCallable, help_text: str = "", aliases: Optional[List[str]] = None, admin_only: bool = False, source: str = "core"):
-        self.name = name.lower() # store command names in lowercase
+        self.name = sys.intern(name.lower()) # store command names in lowercase, interned like the lookup keys
         self.func = func
         self.help_text = help_text
-        self.aliases = [alias.lower() for alias in aliases] if aliases else []
+        self.aliases = tuple(sys.intern(alias.lower()) for alias in aliases) if aliases else () # immutable, safe to share
         self.admin_only = admin_only
         self.source = source # e.g., 'core' or plugin name
-        self.enabled = True # commands are enabled by default
+        self.enabled = True # commands are enabled by default (also picks the execute implementation)
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
 
-    def execute(self, user: Dict[str, Any], args: List[str]):
-        """executes the command's function."""
-        if not self.enabled:
-            logger.warning(f"attempted to execute disabled command: !{self.name}")
-            # optionally notify user or event bus
-            return
+    @enabled.setter
+    def enabled(self, value: bool):
+        # swap the bound execute once here instead of checking the flag on every call
+        self._enabled = value
+        self.execute = self._execute_enabled if value else self._execute_disabled
 
+    def _execute_disabled(self, user: Dict[str, Any], args: List[str]):
+        """execute() while the command is disabled."""
+        logger.warning(f"attempted to execute disabled command: !{self.name}")
+        # optionally notify user or event bus
+
+    def _execute_enabled(self, user: Dict[str, Any], args: List[str]):
+        """executes the command's function. execute() while the command is enabled."""
         # todo: add admin check logic here if needed, potentially using config
         # if self.admin_only and not is_admin(user):
         #     logger.warning(f"user {user['name']} attempted to run admin command !{self.name}")
         #     # notify user?
         #     return
 
+        func = self.func
         try:
-            logger.info(f"executing command !{self.name} for user {user['name']} with args: {args}")
-            self.func(user, args)
-        except Exception as e:
-            logger.error(f"error executing command !{self.name}: {e}", exc_info=True)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("executing command !%s for user %s with args: %s", self.name, user['name'], args)
+            func(user, args)
+        except Exception:
+            logger.exception("error executing command !%s", self.name)
             # optionally notify user or event bus about the error
 
     def __str__(self):
@@ -50,54 +66,54 @@ class CommandManager:
     """manages registration and lookup of commands."""
 
     def __init__(self, event_bus: EventBus):
-        self._commands: Dict[str, Command] = {} # maps name/alias to command object
+        self._by_name: Dict[str, Command] = {} # maps canonical name to command object
+        self._by_alias: Dict[str, Command] = {} # maps name and every alias to command object
         self._event_bus = event_bus # may be used for events like command_registered
         logger.info("CommandManager initialized.")
 
     def register_command(self, name: str, func: CommandCallable, help_text: str = "", aliases: Optional[List[str]] = None, admin_only: bool = False, source: str = "core") -> bool:
         """registers a new command."""
-        command_name = name.lower()
-        if command_name in self._commands:
-            logger.error(f"command registration failed: name '{command_name}' already registered by {self._commands[command_name].source}.")
+        command_name = sys.intern(name.lower())
+        if command_name in self._by_alias:
+            logger.error(f"command registration failed: name '{command_name}' already registered by {self._by_alias[command_name].source}.")
             return False
 
-        # check aliases for conflicts
-        if aliases:
-            for alias in aliases:
-                alias_lower = alias.lower()
-                if alias_lower in self._commands:
-                     logger.error(f"command registration failed: alias '{alias_lower}' for command '{command_name}' already registered by {self._commands[alias_lower].source}.")
-                     return False
+        # check all aliases for conflicts before anything is stored
+        aliases_lower = [alias.lower() for alias in aliases] if aliases else []
+        if not self._by_alias.keys().isdisjoint(aliases_lower):
+            alias_lower = next(alias for alias in aliases_lower if alias in self._by_alias) # first conflict, for the message
+            logger.error(f"command registration failed: alias '{alias_lower}' for command '{command_name}' already registered by {self._by_alias[alias_lower].source}.")
+            return False
 
-        # create and store command
+        # create and store command, name and aliases in one update
         command = Command(name=command_name, func=func, help_text=help_text, aliases=aliases, admin_only=admin_only, source=source)
-        self._commands[command_name] = command
-        if aliases:
-            for alias in command.aliases:
-                self._commands[alias] = command # map aliases directly to the command object
+        self._by_name[command_name] = command
+        mapping = {command_name: command}
+        mapping.update(dict.fromkeys(command.aliases, command)) # map aliases directly to the command object
+        self._by_alias.update(mapping)
 
         logger.info(f"command registered: !{command_name} (aliases: {command.aliases}, source: {source})")
         # optionally publish an event
         # self._event_bus.publish("command_registered", command=command)
         return True
 
+    def register_many(self, specs: Iterable[Dict[str, Any]]) -> int:
+        """registers several commands, each given as register_command keyword arguments. returns how many succeeded."""
+        return sum(1 for spec in specs if self.register_command(**spec))
+
     def unregister_command(self, name: str) -> bool:
         """unregisters a command and its aliases."""
         command_name = name.lower()
-        command = self._commands.get(command_name)
+        command = self._by_name.pop(command_name, None) # only canonical names, not aliases
 
-        if not command or command.name != command_name: # ensure we are removing the main name, not an alias
+        if not command:
              logger.warning(f"command unregistration failed: command '{command_name}' not found or '{name}' is an alias.")
              return False
 
-        # remove main name
-        del self._commands[command_name]
-
-        # remove aliases
-        if command.aliases:
-            for alias in command.aliases:
-                if alias in self._commands and self._commands[alias] == command:
-                    del self._commands[alias]
+        # remove main name and aliases; register_command never lets another command claim either
+        self._by_alias.pop(command_name, None)
+        for alias in command.aliases:
+            self._by_alias.pop(alias, None)
 
         logger.info(f"command unregistered: !{command_name} (source: {command.source})")
         # optionally publish an event
@@ -106,17 +122,15 @@ class CommandManager:
 
     def get_command(self, name: str) -> Optional[Command]:
         """finds a command by its name or alias."""
-        logger.debug(f"looking up command/alias for raw input: '{name}'") # log raw input
-        name_lower = name.lower() # convert to lowercase
-        logger.debug(f"attempting lookup with lowercased name: '{name_lower}'")
-        command = self._commands.get(name_lower)
-        logger.debug(f"lookup result: {'found' if command else 'not found'}") # log result
+        name_lower = sys.intern(name.lower()) # interned keys let the dict lookup match on identity
+        command = self._by_alias.get(name_lower)
+        if logger.isEnabledFor(logging.DEBUG): # runs per chat command, skip the call entirely when not debugging
+            logger.debug("command lookup '%s' -> '%s': %s", name, name_lower, 'found' if command else 'not found')
         return command
 
     def get_all_commands(self) -> List[Command]:
         """returns a list of unique registered command objects."""
-        # use a set to get unique command objects, as aliases point to the same object
-        return list({cmd for cmd in self._commands.values()})
+        return list(self._by_name.values()) # canonical names only, so no alias duplicates
 
     def enable_command(self, name: str):
         """enables a command."""
@@ -1,21 +1,40 @@
+import copy
 import json
 import os
 import logging
-from typing import Dict, Any # Import Dict and Any
+import mmap
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Tuple # Import Dict and Any
 
-# Import jsonschema if available, otherwise handle gracefully
+# jsonschema is optional and slow to import, so it's only imported when a config is first validated (see _get_validator)
+_jsonschema = None # the module once imported, False if it isn't installed
+
+# Use orjson for parsing/serializing if available, otherwise the stdlib json module
 try:
-    from jsonschema import validate
-    from jsonschema.exceptions import ValidationError
-    _jsonschema_available = True
+    import orjson
+    _loads = orjson.loads
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
 except ImportError:
-    _jsonschema_available = False
-    validate = None
-    ValidationError = None
-    logging.warning("jsonschema library not found. Configuration validation will be skipped.")
+    orjson = None
+    _loads = json.loads # accepts bytes as well
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8') # Use indent=2 for readability
+
+
+# Configs at least this large are parsed straight from an mmap when orjson is available; below it the mapping costs more than the copy
+_MMAP_THRESHOLD = 16 * 1024
 
+def _read_json(f, size: int) -> Any:
+    """Parses the open binary file f (of the given size), mapping it instead of reading it when that pays off."""
+    if orjson is None or size < _MMAP_THRESHOLD: # the stdlib json.loads can't take a buffer
+        return _loads(f.read())
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view: # released before the map closes
+            return orjson.loads(view)
 
-DEFAULT_CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config.json'))
+DEFAULT_CONFIG_PATH = str(Path(__file__).resolve().parent.parent / 'config.json') # resolved once at import
 
 # --- Define Configuration Schema ---
 # Based on observed usage and config.json example
@@ -42,24 +61,111 @@ CONFIG_SCHEMA = {
             "type": ["string", "null"], # Allow null or string
             "default": None,
             "description": "Substring to identify the virtual audio output device (e.g., 'CABLE Input'). Null/empty uses default."
+        },
+        "blocksize": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 0,
+            "description": "Frames per audio callback. 0 lets PortAudio choose the host API's native buffer size."
+        },
+        "resample_to_device": {
+            "type": "boolean",
+            "default": True,
+            "description": "Resample tracks to the output device's native samplerate with soxr (if installed) instead of relying on PortAudio."
+        },
+        "adaptive_blocksize": {
+            "type": "boolean",
+            "default": True,
+            "description": "Double the blocksize after tracks with repeated underruns (up to 8192) and shrink it back after clean playback."
+        },
+        "inline_threshold_bytes": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 1048576,
+            "description": "Audio files smaller than this are decoded once and kept in memory for replays."
+        },
+        "decoded_cache_bytes": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 67108864,
+            "description": "Memory budget for decoded in-memory audio; least recently used files are evicted first."
+        },
+        "rt_priority": {
+            "type": "integer",
+            "minimum": 0,
+            "maximum": 99,
+            "default": 10,
+            "description": "Realtime priority for the audio threads (SCHED_FIFO on Linux, time critical on Windows). 0 disables it."
+        },
+        "audio_cpu_affinity": {
+            "type": ["integer", "null"],
+            "minimum": 0,
+            "default": None,
+            "description": "CPU index to pin the audio playback thread to (Linux only). Null leaves it unpinned."
+        },
+        "prefetch_depth": {
+            "type": "integer",
+            "minimum": 1,
+            "default": 4,
+            "description": "Number of queued audio files read ahead in parallel."
+        },
+        "prefetch_bytes": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 1048576,
+            "description": "Bytes read from the start of each queued audio file to warm the page cache."
+        },
+        "prefill_ms": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 80,
+            "description": "Milliseconds of audio decoded before playback of a track starts."
         }
     },
     "required": ["game_dir", "admin_user"],
     "additionalProperties": False # Disallow extra properties not defined in the schema
 }
 
+# (key, default) for every schema property that has one, extracted once instead of on every load
+_DEFAULTS = tuple((key, prop["default"]) for key, prop in CONFIG_SCHEMA["properties"].items() if "default" in prop)
+
+# --- Compiled Validator ---
+# Built once instead of letting jsonschema.validate() re-check the schema and pick a validator class on every load
+_VALIDATOR = None
+
+def _get_validator():
+    """Returns the CONFIG_SCHEMA validator, importing jsonschema on first use. None if it isn't installed."""
+    global _jsonschema, _VALIDATOR
+    if _jsonschema is None:
+        try:
+            import jsonschema
+            import jsonschema.validators
+        except ImportError:
+            _jsonschema = False
+            logging.warning("jsonschema library not found. Configuration validation will be skipped.")
+            return None
+        validator_cls = jsonschema.validators.validator_for(CONFIG_SCHEMA)
+        validator_cls.check_schema(CONFIG_SCHEMA)
+        _VALIDATOR = validator_cls(CONFIG_SCHEMA)
+        _jsonschema = jsonschema
+    return _VALIDATOR
+
+# --- Load Cache ---
+# config_path -> ((st_mtime_ns, st_size), validated config). load_config re-parses only when the file changed.
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
 # --- Custom Exception ---
 class ConfigError(Exception):
     """Custom exception for configuration loading errors."""
     pass
 
 
-def _apply_defaults(config_data: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+def _apply_defaults(config_data: Dict[str, Any]) -> Dict[str, Any]:
     """Applies default values from the schema to the config data."""
-    for key, prop_schema in schema.get("properties", {}).items():
-        if "default" in prop_schema and key not in config_data:
-            config_data[key] = prop_schema["default"]
-            logging.debug(f"Applied default value for config key '{key}': {config_data[key]}")
+    for key, default in _DEFAULTS:
+        if key not in config_data:
+            config_data[key] = copy.copy(default) # don't share mutable defaults (lists) between configs
+            logging.debug("Applied default value for config key '%s': %s", key, default)
     return config_data
 
 def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
@@ -74,13 +180,20 @@ def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
     Raises:
         ConfigError: If the file doesn't exist, is invalid JSON, or fails schema validation.
     """
-    if not os.path.exists(config_path):
-        raise ConfigError(f"Configuration file not found: {config_path}")
-
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-    except json.JSONDecodeError as e:
+        with open(config_path, 'rb') as f:
+            # --- Cached Result ---
+            # stamp taken from the open file, so it always describes what gets read below
+            st = os.fstat(f.fileno())
+            file_key = (st.st_mtime_ns, st.st_size)
+            cached = _CONFIG_CACHE.get(config_path)
+            if cached and cached[0] == file_key:
+                logging.debug("Configuration unchanged, using cached copy of %s", config_path)
+                return copy.deepcopy(cached[1]) # callers may modify their copy
+            config_data = _read_json(f, st.st_size)
+    except FileNotFoundError as e:
+        raise ConfigError(f"Configuration file not found: {config_path}") from e
+    except json.JSONDecodeError as e: # orjson.JSONDecodeError is a subclass
         raise ConfigError(f"Error decoding JSON configuration file {config_path}: {e}") from e
     except IOError as e:
         raise ConfigError(f"Error reading configuration file {config_path}: {e}") from e
@@ -88,14 +201,17 @@ def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
         raise ConfigError(f"Unexpected error loading configuration file {config_path}: {e}") from e
 
     # --- Apply Defaults ---
-    config_data = _apply_defaults(config_data, CONFIG_SCHEMA)
+    config_data = _apply_defaults(config_data)
 
     # --- Validate Schema ---
-    if _jsonschema_available and validate:
+    validator = _get_validator()
+    if validator is not None:
         try:
-            validate(instance=config_data, schema=CONFIG_SCHEMA)
+            error = _jsonschema.exceptions.best_match(validator.iter_errors(config_data)) # same error jsonschema.validate() would pick
+            if error is not None:
+                raise error
             logging.info(f"Configuration loaded and validated successfully from {config_path}")
-        except ValidationError as e:
+        except _jsonschema.exceptions.ValidationError as e:
             # Provide a more helpful error message
             error_message = f"Configuration validation failed: {e.message} (path: {'/'.join(map(str, e.path))})"
             logging.error(error_message) # Log the specific validation error
@@ -105,12 +221,15 @@ def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
             raise ConfigError(error_message) from e
         except Exception as e: # Catch unexpected validation errors
              raise ConfigError(f"Unexpected error during configuration validation: {e}") from e
-    elif not _jsonschema_available:
+    else:
          logging.warning(f"Configuration loaded from {config_path}, but schema validation skipped (jsonschema not installed).")
     # ---------------------
 
+    _CONFIG_CACHE[config_path] = (file_key, copy.deepcopy(config_data))
     return config_data
 
+load_config.cache_clear = _CONFIG_CACHE.clear # forget every cached config, e.g. between tests
+
 def save_config(config_data: Dict[str, Any], config_path: str = DEFAULT_CONFIG_PATH):
     """Saves configuration data to a JSON file.
 
@@ -122,23 +241,47 @@ def save_config(config_data: Dict[str, Any], config_path: str = DEFAULT_CONFIG_P
         ConfigError: If there's an error writing the file or serializing data.
     """
     # Optional: Validate before saving?
-    # if _jsonschema_available and validate:
+    # validator = _get_validator()
+    # if validator is not None:
     #     try:
-    #         validate(instance=config_data, schema=CONFIG_SCHEMA)
-    #     except ValidationError as e:
+    #         validator.validate(config_data)
+    #     except _jsonschema.exceptions.ValidationError as e:
     #         raise ConfigError(f"Configuration validation failed before saving: {e.message}") from e
 
+    tmp_path = None
     try:
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2, ensure_ascii=False) # Use indent=2 for readability
-            logging.info(f"Configuration saved successfully to {config_path}")
+        payload = _dumps(config_data) # serialize first, so a bad value never touches the file
+        # write a temp file next to the config and rename it over the original: readers (and
+        # a crash mid-write) only ever see the old or the new file, never a truncated one
+        config_dir = os.path.dirname(config_path) or '.'
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.config-', suffix='.tmp', dir=config_dir)
+        except FileNotFoundError:
+            # only create the directory when it's actually missing
+            os.makedirs(config_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.config-', suffix='.tmp', dir=config_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(config_path).st_mode & 0o777) # keep the existing permissions
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644) # mkstemp creates 0600
+        os.replace(tmp_path, config_path)
+        tmp_path = None
+        _CONFIG_CACHE.pop(config_path, None) # don't trust mtime alone on coarse-grained filesystems
+        logging.info(f"Configuration saved successfully to {config_path}")
     except IOError as e:
         raise ConfigError(f"Error writing configuration file {config_path}: {e}") from e
-    except TypeError as e:
+    except TypeError as e: # orjson.JSONEncodeError is a subclass
         raise ConfigError(f"Error serializing configuration data to JSON: {e}") from e
     except Exception as e: # Catch unexpected errors during save
         raise ConfigError(f"Unexpected error saving configuration file {config_path}: {e}") from e
+    finally:
+        if tmp_path is not None: # failed before the rename, don't leave the temp file behind
+            try: os.unlink(tmp_path)
+            except OSError: pass
 
 # example usage (can be removed or kept for testing)
 if __name__ == '__main__':
@@ -197,7 +340,7 @@ if __name__ == '__main__':
                  except Exception: pass
 
     # Run tests only if jsonschema is available for validation tests
-    if _jsonschema_available:
+    if _get_validator() is not None:
         run_test(valid_data, "Valid Config")
         run_test(invalid_data_missing, "Invalid Config (Missing Required)")
         run_test(invalid_data_type, "Invalid Config (Wrong Type)")
@@ -1,15 +1,19 @@
+import atexit
+import functools
 import logging
 import threading
 import os
+import hashlib
+import io
+import subprocess
 import tempfile
 import uuid # Import uuid for unique filenames
-import time # Import time for sleep
+import time # Import time for polling file readiness
 import yt_dlp # requires yt-dlp package
 from gtts import gTTS, gTTSError # Import gTTS
-from pydub import AudioSegment # Import pydub
-from typing import List, Dict, Any
-import sounddevice as sd # Import sounddevice for direct playback
-import soundfile as sf   # Import soundfile for reading WAV data
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Tuple
+import numpy as np
 
 # assuming commandmanager and audioplayer are accessible via imports or passed in
 from src.command_manager import CommandManager
@@ -17,216 +21,592 @@ from src.audio_player import AudioPlayer
 
 logger = logging.getLogger(__name__)
 
+# sounddevice/soundfile (direct tts playback, reading wav data) are imported by register(),
+# see _import_audio_backends, so importing this module doesn't load portaudio/libsndfile
+sd = None
+sf = None
+
 # --- !play command logic ---
 
-# global variable to hold the audioplayer instance (or pass it into register)
-# this is simpler than using events for direct command->action flow
-_audio_player_instance: AudioPlayer | None = None
+# the audioplayer instance is bound into each handler by register(), see _with_audio_player
+
+# worker pools for the slow parts of !play and !tts, created in register()
+# !play is split in two stages, so one request's ffmpeg transcode overlaps the next one's download
+DOWNLOAD_WORKERS = 4
+FFMPEG_WORKERS = os.cpu_count() or 2
+TTS_WORKERS = 2
+MAX_PENDING_DOWNLOADS = 8 # running plus waiting; more than this and new requests are turned away
+MAX_PENDING_TTS = 4
+_download_pool: ThreadPoolExecutor | None = None
+_ffmpeg_pool: ThreadPoolExecutor | None = None
+_tts_pool: ThreadPoolExecutor | None = None
+_download_slots = threading.BoundedSemaphore(MAX_PENDING_DOWNLOADS)
+_tts_slots = threading.BoundedSemaphore(MAX_PENDING_TTS)
+
+def _submit(pool: ThreadPoolExecutor, slots: threading.BoundedSemaphore, job: Callable[[], None], what: str) -> bool:
+    """runs job on pool unless too many are already pending. returns false if it was rejected."""
+    if not slots.acquire(blocking=False):
+        logger.warning(f"too many {what} requests pending, ignoring this one.")
+        return False
+    try:
+        future = pool.submit(job)
+    except RuntimeError as e: # pool already shut down
+        slots.release()
+        logger.error(f"could not start {what} job: {e}")
+        return False
+    future.add_done_callback(lambda _: slots.release())
+    return True
 
 # temporary directory for downloads and tts files
 TEMP_DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), "requestify_py_downloads")
-os.makedirs(TEMP_DOWNLOAD_DIR, exist_ok=True)
-
-def _download_audio(url_or_search: str) -> str | None:
-    """downloads audio using yt-dlp and returns the file path."""
-    logger.info(f"attempting to download/extract audio for: {url_or_search}")
-
-    # configure yt-dlp options
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'outtmpl': os.path.join(TEMP_DOWNLOAD_DIR, '%(id)s.%(ext)s'), # save as id.ext
-        'noplaylist': True,
-        'default_search': 'ytsearch1', # search youtube and get first result
-        'quiet': True,
-        'no_warnings': True,
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'wav', # extract to wav for easier playback with soundfile
-            'preferredquality': '192', # standard quality
-        }],
-        'logger': logging.getLogger('yt_dlp'), # integrate yt-dlp logging
-        # 'nocheckcertificate': True, # uncomment if needed
-        # 'geo_bypass': True, # uncomment if needed
-    }
 
-    downloaded_file_path = None
-    final_file_path = None # Path to return
-    info_dict = None # initialize info_dict to prevent unboundlocalerror
+# the directories are created on first use rather than at import
+_temp_dirs_ready = False
+_temp_dirs_lock = threading.Lock()
+
+def _ensure_temp_dirs():
+    """creates the temp and cache directories the first time a command needs them."""
+    global _temp_dirs_ready
+    if _temp_dirs_ready: # no lock once they exist
+        return
+    with _temp_dirs_lock:
+        if _temp_dirs_ready:
+            return
+        os.makedirs(DOWNLOAD_CACHE_DIR, exist_ok=True) # also creates TEMP_DOWNLOAD_DIR
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        _temp_dirs_ready = True
+
+# extracted wavs are kept here across runs, named by a hash of the video they came from
+DOWNLOAD_CACHE_DIR = os.path.join(TEMP_DOWNLOAD_DIR, "cache")
+DOWNLOAD_CACHE_MAX_BYTES = 1024 * 1024 * 1024 # least recently played files go first past this
+DOWNLOAD_CACHE_MAX_FILES = 200 # ... or past this many files
+
+# downloads in a container soundfile decodes itself are played as they are, everything else is converted to wav.
+# filled in by _import_audio_backends once soundfile is loaded
+_DIRECT_PLAY_EXTS: frozenset = frozenset()
+_CACHED_EXTS: Tuple[str, ...] = ('.wav',) # wav first, it's what most downloads end up as
+
+# normalized query -> cached wav, so a repeated !play doesn't even need to resolve the video
+_query_cache: Dict[str, str] = {}
+_query_cache_lock = threading.Lock()
+
+# normalized query -> future for the download already running for it, so duplicate requests share it
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+def _forget_inflight(query_key: str):
+    with _inflight_lock:
+        _inflight.pop(query_key, None)
+
+def _chain_future(source: Future, target: Future):
+    """copies the outcome of source into target."""
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+def _query_key(url_or_search: str) -> str:
+    """normalizes a !play query so trivially different spellings share a cache entry."""
+    query = " ".join(url_or_search.split())
+    return query if "://" in query else query.lower() # urls can be case-sensitive, searches aren't
+
+def _cache_stem(video_key: str) -> str:
+    """returns the download cache path for a video (extractor:id), minus the extension of whatever format got cached."""
+    return os.path.join(DOWNLOAD_CACHE_DIR, hashlib.sha1(video_key.encode('utf-8')).hexdigest())
+
+def _cache_lookup(cache_path: str) -> bool:
+    """checks a cache file exists and marks it as recently used."""
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # execute the download/extraction
-            info_dict = ydl.extract_info(url_or_search, download=True) # this might raise downloaderror
-
-            # --- Determine the final path (Handles both direct URL and search results) ---
-            entry_info = info_dict # Default to top-level dict for direct URLs
-
-            # If 'entries' exists, it's likely a search result, use the first entry
-            if 'entries' in info_dict and info_dict['entries']:
-                logger.debug("Detected 'entries' key, likely a search result. Using first entry.")
-                entry_info = info_dict['entries'][0]
-            elif info_dict.get('_type') == 'playlist':
-                 logger.warning("yt-dlp returned a playlist type directly, but no 'entries'. This might be unexpected.")
-                 # Attempt to use top-level info anyway, might fail.
-
-            # Now extract path info from the determined dictionary (entry_info)
-            if 'requested_downloads' in entry_info and entry_info['requested_downloads']:
-                 downloaded_file_path = entry_info['requested_downloads'][0]['filepath']
-                 logger.info(f"yt-dlp finished. Extracted audio path: {downloaded_file_path}")
-            elif 'filepath' in entry_info: # Fallback if postprocessor didn't populate requested_downloads
-                 downloaded_file_path = entry_info['filepath']
-                 logger.warning(f"yt-dlp finished, using 'filepath' from entry_info: {downloaded_file_path}. Check if correct format.")
-            else:
-                 # Log detailed info if path extraction fails
-                 logger.error(f"Could not determine downloaded file path from yt-dlp info for: {url_or_search}")
-                 logger.debug(f"Top-level info_dict: {info_dict}")
-                 if entry_info is not info_dict: # Log entry_info only if it's different
-                     logger.debug(f"Used entry_info: {entry_info}")
-                 return None
-
-            # --- Check for expected WAV file after postprocessing ---
-            # Ensure downloaded_file_path is not None before proceeding
-            if downloaded_file_path is None:
-                 logger.error("Internal error: downloaded_file_path became None before WAV check.")
-                 return None
-
-            expected_path = os.path.splitext(downloaded_file_path)[0] + '.wav'
-            if os.path.exists(expected_path):
-                 logger.info(f"Confirmed extracted WAV file exists: {expected_path}")
-                 final_file_path = expected_path
-            elif os.path.exists(downloaded_file_path):
-                 logger.warning(f"Postprocessing to WAV might have failed. Using original downloaded file: {downloaded_file_path}")
-                 final_file_path = downloaded_file_path # Return original if WAV not found
-            else:
-                 logger.error(f"Neither expected WAV nor original download path found after yt-dlp: {expected_path} / {downloaded_file_path}")
-                 return None
+        os.utime(cache_path) # bumps the mtime eviction goes by, and fails if the file is gone
+    except OSError:
+        return False
+    return True
+
+def _find_cached(cache_stem: str) -> str | None:
+    """returns the cached file for a video in any format we keep, or None."""
+    for ext in _CACHED_EXTS:
+        if _cache_lookup(cache_stem + ext):
+            return cache_stem + ext
+    return None
+
+def _remember_query(query_key: str, cache_path: str):
+    with _query_cache_lock:
+        _query_cache[query_key] = cache_path
+
+def _evict_lru(cache_dir: str, max_bytes: int, max_files: int | None = None) -> set:
+    """deletes the least recently used files in cache_dir until it fits max_bytes (and max_files). returns the deleted paths."""
+    try:
+        entries = []
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError as e:
+        logger.warning(f"could not scan cache {cache_dir}: {e}")
+        return set()
+
+    total = sum(size for _, size, _ in entries)
+    count = len(entries)
+    evicted = set()
+    if max_files is None:
+        max_files = count
+    if total <= max_bytes and count <= max_files:
+        return evicted
+    for _, size, path in sorted(entries): # oldest first
+        if total <= max_bytes and count <= max_files:
+            break
+        try:
+            os.remove(path)
+        except OSError as e: # e.g. still open for playback on windows
+            logger.debug("could not evict cached file %s: %s", path, e)
+            continue
+        total -= size
+        count -= 1
+        evicted.add(path)
+    if evicted:
+        logger.info(f"evicted {len(evicted)} files from {cache_dir}, it now holds {total // (1024 * 1024)} MiB")
+    return evicted
+
+def _evict_download_cache():
+    """deletes the least recently used cached downloads until the cache fits DOWNLOAD_CACHE_MAX_BYTES."""
+    evicted = _evict_lru(DOWNLOAD_CACHE_DIR, DOWNLOAD_CACHE_MAX_BYTES, DOWNLOAD_CACHE_MAX_FILES)
+    if evicted:
+        with _query_cache_lock:
+            for key in [key for key, path in _query_cache.items() if path in evicted]:
+                del _query_cache[key]
+
+def _store_in_cache(file_path: str, cache_stem: str, query_key: str) -> str:
+    """moves a finished download into the cache and returns its new path (or the old one if the move failed)."""
+    cache_path = cache_stem + os.path.splitext(file_path)[1].lower()
+    try:
+        os.replace(file_path, cache_path)
+    except OSError as e:
+        if _cache_lookup(cache_path): # a concurrent request for the same video got there first
+            _remember_query(query_key, cache_path)
+            return cache_path
+        logger.warning(f"could not move {file_path} into the download cache: {e}")
+        return file_path
+    _remember_query(query_key, cache_path)
+    _evict_download_cache()
+    return cache_path
+
+def _resolve_entry(ydl: yt_dlp.YoutubeDL, info: Dict[str, Any]) -> Dict[str, Any]:
+    """follows an unprocessed extract_info result down to the single video to play.
+
+    a plain search comes back as a link to a "ytsearch1:" url, and that as a list of search
+    results; the first result already carries the video id, so a cached video is found
+    without extracting its page or processing formats.
+    """
+    for _ in range(3): # query -> search url -> search results -> first entry
+        result_type = info.get('_type')
+        if result_type == 'url' and not info.get('id'):
+            info = ydl.extract_info(info['url'], download=False, process=False, ie_key=info.get('ie_key'))
+        elif result_type in ('playlist', 'multi_video'):
+            entry = next(iter(info.get('entries') or ()), None) # entries may be a lazy generator
+            if entry is None:
+                break
+            logger.debug("Detected 'entries' key, likely a search result. Using first entry.")
+            info = entry
+        else:
+            break
+    return info
+
+def _fetch_audio(url_or_search: str, query_key: str) -> Tuple[str | None, str | None]:
+    """network stage of !play: resolves and downloads the audio with yt-dlp, without converting it.
 
-        # --- Add delay after ydl context manager exits ---
-        # Give ffmpeg/postprocessor time to release file locks
-        time.sleep(0.5)
-        logger.debug("Short delay added after yt-dlp processing.")
-        # -------------------------------------------------
+    returns (file path, cache stem to store it under). the cache stem is None when the file
+    already comes from the cache, or the video had no id to cache it by. the file path is
+    None if the download failed.
+    """
+    with _query_cache_lock:
+        cached_path = _query_cache.get(query_key)
+    if cached_path and _cache_lookup(cached_path):
+        logger.info("using cached audio for '%s': %s", url_or_search, cached_path)
+        return cached_path, None
 
-        return final_file_path # Return the determined path
+    logger.info("attempting to download/extract audio for: %s", url_or_search)
+
+    downloaded_file_path = None
+    cache_stem = None # where the audio gets cached once we know which video it is
+    try:
+        ydl = _get_ydl() # this worker's long-lived instance
+        # resolve the query first, so a video we already extracted isn't fetched again
+        info_dict = ydl.extract_info(url_or_search, download=False, process=False) # this might raise downloaderror
+
+        # --- Determine the entry to play (Handles both direct URL and search results) ---
+        entry_info = _resolve_entry(ydl, info_dict)
+        if entry_info.get('_type') == 'playlist':
+             logger.warning("yt-dlp returned a playlist type directly, but no 'entries'. This might be unexpected.")
+             # Attempt to use top-level info anyway, might fail.
+
+        if entry_info.get('id'):
+            # search results only carry ie_key, extracted videos extractor_key; both name the extractor
+            extractor = entry_info.get('extractor_key') or entry_info.get('ie_key', '')
+            cache_stem = _cache_stem(f"{extractor}:{entry_info['id']}")
+            cached_path = _find_cached(cache_stem)
+            if cached_path:
+                logger.info("using cached audio for '%s': %s", url_or_search, cached_path)
+                _remember_query(query_key, cached_path)
+                return cached_path, None
+
+        # execute the download of the resolved entry (extracts the video page first if all we have is a search result)
+        _ydl_local.filepath = None # set by _capture_filepath once yt-dlp is done with the file
+        entry_info = ydl.process_ie_result(entry_info, download=True) # this might raise downloaderror
+        downloaded_file_path = _ydl_local.filepath
+        if downloaded_file_path is None:
+             logger.error("Could not determine downloaded file path from yt-dlp info for: %s", url_or_search)
+             if logger.isEnabledFor(logging.DEBUG): # these dicts are big, don't even repr them otherwise
+                 logger.debug("Used entry_info: %r", entry_info)
+             return None, None
+        logger.info("yt-dlp finished. Downloaded audio path: %s", downloaded_file_path)
+
+        # make sure nothing still holds the file before it's converted or moved into the cache
+        try:
+            if not _await_file_ready(downloaded_file_path):
+                logger.warning("downloaded file still busy after waiting, continuing anyway: %s", downloaded_file_path)
+        except FileNotFoundError:
+            logger.error("Downloaded file not found after yt-dlp: %s", downloaded_file_path)
+            return None, None
+
+        return downloaded_file_path, cache_stem
 
     except PermissionError as e:
-        logger.error(f"permissionerror during yt-dlp postprocessing for '{url_or_search}': {e}", exc_info=True)
-        # --- Fix TypeError: Check if info_dict exists before accessing ---
-        if info_dict and 'filepath' in info_dict and os.path.exists(info_dict['filepath']):
-             logger.warning(f"returning original download path due to permissionerror: {info_dict['filepath']}")
-             return info_dict.get('filepath') # use .get() for safety
-        # -----------------------------------------------------------------
-        return None
+        logger.error(f"permissionerror during yt-dlp processing for '{url_or_search}': {e}", exc_info=True)
+        if downloaded_file_path and os.path.exists(downloaded_file_path):
+             logger.warning("returning original download path due to permissionerror: %s", downloaded_file_path)
+             return downloaded_file_path, None
+        return None, None
     except yt_dlp.utils.DownloadError as e:
         err_str = str(e)
         if "warning: unable to obtain file audio codec with ffprobe" in err_str:
-             logger.warning(f"yt-dlp downloaderror contained ffprobe warning for '{url_or_search}': {err_str}")
-             return None
+             logger.warning("yt-dlp downloaderror contained ffprobe warning for '%s': %s", url_or_search, err_str)
+             return None, None
         elif "unable to rename file" in err_str:
-             logger.error(f"yt-dlp file rename error for '{url_or_search}': {err_str}")
-             return None
+             logger.error("yt-dlp file rename error for '%s': %s", url_or_search, err_str)
+             return None, None
         else:
-             logger.error(f"yt-dlp downloaderror for '{url_or_search}': {err_str}")
-             return None
+             logger.error("yt-dlp downloaderror for '%s': %s", url_or_search, err_str)
+             return None, None
     except Exception as e:
         logger.error(f"unexpected error during yt-dlp processing for '{url_or_search}': {e}", exc_info=True)
-        return None
+        return None, None
 
+# probe less of the input before converting: our inputs are single-stream audio, so the defaults
+# (5 MB / 5 s of analysis) only add startup time. these must come before -i. much smaller than
+# this and ffmpeg can fail to identify webm/m4a streams.
+_FFMPEG_INPUT_ARGS = ("-probesize", "1M", "-analyzeduration", "500000")
 
-def cmd_play(user: Dict[str, Any], args: List[str]):
-    """handles the !play command."""
-    global _audio_player_instance
-    if not _audio_player_instance:
-        logger.error("audioplayer instance not available for !play command.")
-        # todo: notify user?
-        return
+def _extract_wav(source_path: str, cache_stem: str | None, query_key: str) -> str:
+    """cpu stage of !play: converts a download to wav with ffmpeg for easier playback with soundfile.
 
+    returns the wav (moved into the download cache when cache_stem is given), or the
+    original file if the conversion fails.
+    """
+    wav_path = os.path.splitext(source_path)[0] + '.wav'
+    try:
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-y", *_FFMPEG_INPUT_ARGS, "-i", source_path, "-vn", "-f", "wav", wav_path],
+            check=True, capture_output=True,
+        )
+    except FileNotFoundError:
+        logger.error("ffmpeg not found in PATH. Using original downloaded file: %s", source_path)
+        return source_path
+    except subprocess.CalledProcessError as e:
+        logger.warning("ffmpeg could not convert %s to wav (%s). Using original downloaded file.", source_path, e.stderr.decode(errors='replace').strip())
+        try:
+            os.remove(wav_path) # partial output
+        except OSError:
+            pass
+        return source_path
+
+    logger.info("converted download to wav: %s", wav_path)
+    try:
+        os.remove(source_path) # like FFmpegExtractAudio, don't keep the original
+    except OSError as e:
+        logger.debug("could not remove original download %s: %s", source_path, e)
+    if cache_stem:
+        return _store_in_cache(wav_path, cache_stem, query_key)
+    return wav_path
+
+# configure yt-dlp options
+def _capture_filepath(filepath: str):
+    """yt-dlp post hook: records where the finished file ended up, for the worker that downloaded it."""
+    _ydl_local.filepath = filepath
+
+_YDL_OPTS = {
+    'format': 'bestaudio[acodec!=none]/bestaudio/best', # audio-only streams, a muxed a/v file only as a last resort
+    'format_sort': ['acodec:opus', 'abr'], # small audio-only containers first
+    'outtmpl': os.path.join(TEMP_DOWNLOAD_DIR, '%(id)s.%(ext)s'), # save as id.ext
+    'noplaylist': True,
+    'default_search': 'ytsearch1', # search youtube and get first result
+    'quiet': True,
+    'no_warnings': True,
+    'concurrent_fragment_downloads': 8, # dash/hls fragments in parallel instead of one at a time
+    'http_chunk_size': 10 * 1024 * 1024, # ranged requests, sidesteps per-connection throttling on plain http streams
+    'retries': 3,
+    'fragment_retries': 3,
+    # no FFmpegExtractAudio postprocessor: the wav extraction runs separately on _ffmpeg_pool
+    'post_hooks': [_capture_filepath], # called with the final path once yt-dlp is done, already-downloaded files included
+    'logger': logging.getLogger('yt_dlp'), # integrate yt-dlp logging
+    # 'nocheckcertificate': True, # uncomment if needed
+    # 'geo_bypass': True, # uncomment if needed
+}
+
+# YoutubeDL setup (option parsing, extractor init, cookies) is paid once per download
+# worker instead of once per !play. instances aren't thread-safe, so each worker owns one.
+_ydl_local = threading.local()
+_ydl_instances: List[yt_dlp.YoutubeDL] = []
+_ydl_instances_lock = threading.Lock()
+
+def _get_ydl() -> yt_dlp.YoutubeDL:
+    """returns the calling thread's YoutubeDL, creating it on first use."""
+    ydl = getattr(_ydl_local, 'ydl', None)
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(_YDL_OPTS)
+        _ydl_local.ydl = ydl
+        with _ydl_instances_lock:
+            _ydl_instances.append(ydl)
+    return ydl
+
+def _close_ydls():
+    """closes every YoutubeDL handed out by _get_ydl."""
+    with _ydl_instances_lock:
+        instances = _ydl_instances[:]
+        _ydl_instances.clear()
+    for ydl in instances:
+        try:
+            ydl.close()
+        except Exception as e:
+            logger.debug("error closing YoutubeDL instance: %s", e)
+
+atexit.register(_close_ydls)
+
+def _await_file_ready(path: str, timeout: float = 2.0) -> bool:
+    """waits until a just-written file has stopped growing and can be opened. returns false on timeout.
+
+    replaces fixed sleeps: usually returns after one 20ms poll, but still covers a file a
+    scanner or indexer briefly keeps locked on windows. the first stat doubles as the
+    existence check, FileNotFoundError is raised if the file isn't there at all.
+    """
+    deadline = time.monotonic() + timeout
+    last_size = os.stat(path).st_size
+    while True:
+        time.sleep(0.02)
+        try:
+            size = os.stat(path).st_size
+            if size == last_size:
+                with open(path, 'rb'):
+                    return True
+            last_size = size
+        except OSError:
+            pass # still locked
+        if time.monotonic() >= deadline:
+            return False
+
+def _download_audio(url_or_search: str) -> "Future[str | None]":
+    """downloads audio using yt-dlp and returns a future for the playable file path (None on failure).
+
+    the download runs in the calling thread, the wav conversion on _ffmpeg_pool. repeat
+    requests are served from the download cache and come back already resolved.
+    """
+    _ensure_temp_dirs()
+    query_key = _query_key(url_or_search)
+    file_path, cache_stem = _fetch_audio(url_or_search, query_key)
+    if file_path is None or os.path.splitext(file_path)[1].lower() in _CACHED_EXTS: # failed, cached, or nothing to convert
+        if file_path and cache_stem:
+            file_path = _store_in_cache(file_path, cache_stem, query_key)
+        done: Future = Future()
+        done.set_result(file_path)
+        return done
+    return _ffmpeg_pool.submit(_extract_wav, file_path, cache_stem, query_key)
+
+
+def cmd_play(audio_player: AudioPlayer, user: Dict[str, Any], args: List[str]):
+    """handles the !play command."""
     if not args:
-        logger.warning(f"user {user['name']} used !play without arguments.")
+        logger.warning("user %s used !play without arguments.", user['name'])
         # todo: send help message to user?
         return
 
     query = " ".join(args)
-    logger.info(f"user {user['name']} requested to play: {query}")
+    logger.info("user %s requested to play: %s", user['name'], query)
 
     # run download in a separate thread to avoid blocking the command executor
     def download_and_play():
-        file_path = _download_audio(query)
+        # settle pending once the conversion finishes, without holding this download worker
+        try:
+            _download_audio(query).add_done_callback(lambda f: _chain_future(f, pending))
+        except Exception as e:
+            pending.set_exception(e)
+
+    def queue_download(future: Future):
+        if future.cancelled(): # turned away, or the pool shut down before the conversion ran
+            return
+        try:
+            file_path = future.result()
+        except Exception as e:
+            logger.error(f"error converting download for '{query}': {e}", exc_info=True)
+            return
         if file_path:
-            # --- Add another small delay before queueing ---
-            time.sleep(0.2)
-            # ---------------------------------------------
-            if os.path.exists(file_path):
-                logger.info(f"Queueing downloaded file: {file_path}")
-                _audio_player_instance.play_file(file_path)
-                # todo: optionally add cleanup for downloaded files later
-            else:
-                 logger.error(f"downloaded file path reported but not found: {file_path}")
+            logger.info("Queueing downloaded file: %s", file_path)
+            # play_file checks the file exists and is readable audio, and says so right away
+            if not audio_player.play_file(file_path):
+                logger.error("downloaded file could not be queued: %s", file_path)
+                # todo: notify user of failure?
+            # todo: optionally add cleanup for downloaded files later
         else:
-            logger.error(f"failed to get audio file for query: {query}")
+            logger.error("failed to get audio file for query: %s", query)
             # todo: notify user of failure?
 
-    download_thread = threading.Thread(target=download_and_play, daemon=True)
-    download_thread.start()
+    query_key = _query_key(query)
+    with _inflight_lock:
+        pending = _inflight.get(query_key)
+        duplicate = pending is not None
+        if not duplicate:
+            pending = _inflight[query_key] = Future()
+    if duplicate: # someone asked for the same thing a moment ago, queue it again when that download lands
+        logger.info("download for '%s' already in progress, queueing it again once it finishes.", query)
+        pending.add_done_callback(queue_download)
+        return
+
+    pending.add_done_callback(lambda _: _forget_inflight(query_key))
+    pending.add_done_callback(queue_download)
+    if not _submit(_download_pool, _download_slots, download_and_play, "download"):
+        pending.cancel() # drops it from _inflight too
 
 # --- !stop command logic ---
 
-def cmd_stop(user: Dict[str, Any], args: List[str]):
+def cmd_stop(audio_player: AudioPlayer, user: Dict[str, Any], args: List[str]):
     """handles the !stop command."""
-    global _audio_player_instance
-    if not _audio_player_instance:
-        logger.error("audioplayer instance not available for !stop command.")
-        return
-
-    logger.info(f"user {user['name']} requested to stop playback.")
+    logger.info("user %s requested to stop playback.", user['name'])
     # stop current playback and clear the queue
-    _audio_player_instance.stop_playback(clear_queue=True)
+    audio_player.stop_playback(clear_queue=True)
 
 # --- !queue command logic ---
 
-def cmd_queue(user: Dict[str, Any], args: List[str]):
+def cmd_queue(audio_player: AudioPlayer, user: Dict[str, Any], args: List[str]):
     """handles the !queue command."""
-    global _audio_player_instance
-    if not _audio_player_instance:
-        logger.error("audioplayer instance not available for !queue command.")
-        return
-
-    queue_snapshot = _audio_player_instance.get_queue_snapshot()
+    queue_snapshot = audio_player.get_queue_snapshot()
 
     if not queue_snapshot:
-        logger.info(f"[queue command] playback queue is empty.")
+        logger.info("[queue command] playback queue is empty.")
         # todo: send message back to user in chat when possible
-    else:
-        log_message = "[queue command] current queue:\n"
-        for i, item in enumerate(queue_snapshot):
-            # try to get just the filename
-            filename = os.path.basename(item)
-            log_message += f"  {i+1}. {filename}\n"
-        logger.info(log_message.strip())
+    elif logger.isEnabledFor(logging.INFO): # the log is the only output, don't build the listing for nothing
+        # just the filenames, joined once
+        lines = [f"  {i}. {os.path.basename(item)}" for i, item in enumerate(queue_snapshot, 1)]
+        logger.info("[queue command] current queue:\n%s", "\n".join(lines))
         # todo: send message back to user in chat when possible
 
 # --- !skip command logic ---
 
-def cmd_skip(user: Dict[str, Any], args: List[str]):
+def cmd_skip(audio_player: AudioPlayer, user: Dict[str, Any], args: List[str]):
     """handles the !skip command."""
-    global _audio_player_instance
-    if not _audio_player_instance:
-        logger.error("audioplayer instance not available for !skip command.")
-        return
-
-    logger.info(f"user {user['name']} requested to skip track.")
+    logger.info("user %s requested to skip track.", user['name'])
     # stop current playback *without* clearing the queue
-    _audio_player_instance.stop_playback(clear_queue=False)
+    audio_player.stop_playback(clear_queue=False)
 
 # --- !tts command logic ---
 
-def cmd_tts(user: Dict[str, Any], args: List[str]):
-    """handles the !tts command."""
-    global _audio_player_instance
-    if not _audio_player_instance:
-        logger.error("audioplayer instance not available for !tts command.")
-        # todo: notify user?
+TTS_LANG = 'en' # using english language
+TTS_BOOST_DB = 6.0 # Boost by 6 dB (adjust as needed)
+_TTS_GAIN = 10 ** (TTS_BOOST_DB / 20.0) # applied to the float samples at playback
+_MP3_NATIVE = False # libsndfile >= 1.1 decodes gtts' mp3 itself, set by _import_audio_backends
+TTS_BLOCKSIZE = 2048 # frames per write when streaming a cached phrase
+TTS_SAMPLERATE = 24000 # what gtts produces; ffmpeg decodes to this when libsndfile can't read mp3
+
+# one output stream shared by every phrase, kept open between them instead of opening the device for each.
+# gtts always produces the same format, so in practice it's opened once.
+_tts_stream: "sd.OutputStream | None" = None
+_tts_stream_format: Tuple[int, int, int | None] | None = None # (samplerate, channels, device) it was opened with
+_tts_stream_lock = threading.Lock() # also keeps concurrent phrases from interleaving
+
+# finished tts wavs (at their original volume), named by a hash of what was said and how, so repeated phrases skip gtts and ffmpeg
+TTS_CACHE_DIR = os.path.join(TEMP_DOWNLOAD_DIR, "tts_cache")
+TTS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def _tts_cache_path(text: str) -> str:
+    """returns where the wav for a tts phrase lives in the tts cache."""
+    key = hashlib.sha1(f"{text}|{TTS_LANG}".encode('utf-8')).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, f"tts_{key}.wav")
+
+def _decode_mp3(mp3_buffer: io.BytesIO) -> Tuple[np.ndarray, int]:
+    """decodes mp3 data to float32 samples. in-process through libsndfile when it supports mp3, through one ffmpeg pipe otherwise."""
+    if _MP3_NATIVE:
+        return sf.read(mp3_buffer, dtype='float32')
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", *_FFMPEG_INPUT_ARGS, "-i", "pipe:0", "-ac", "1", "-ar", str(TTS_SAMPLERATE), "-f", "f32le", "pipe:1"],
+        input=mp3_buffer.getvalue(), check=True, capture_output=True,
+    )
+    return np.frombuffer(result.stdout, dtype='<f4').copy(), TTS_SAMPLERATE # copy: the boost is applied in place
+
+def _boost_tts(data: np.ndarray):
+    """applies the tts volume boost to float samples in place."""
+    np.multiply(data, _TTS_GAIN, out=data)
+    np.clip(data, -1.0, 1.0, out=data) # clips like the old int16 boost did
+
+def _tts_output(samplerate: int, channels: int, device_id: int | None) -> "sd.OutputStream":
+    """returns the shared tts stream, (re)opening it only when the format or device changed. caller holds _tts_stream_lock."""
+    global _tts_stream, _tts_stream_format
+    stream_format = (samplerate, channels, device_id)
+    if _tts_stream is None or _tts_stream_format != stream_format or not _tts_stream.active:
+        _close_tts_stream_locked()
+        stream = sd.OutputStream(samplerate=samplerate, channels=channels, device=device_id, dtype='float32')
+        stream.start()
+        _tts_stream, _tts_stream_format = stream, stream_format
+        logger.debug("opened tts output stream: %d Hz, %d channel(s), device %s", samplerate, channels, device_id)
+    return _tts_stream
+
+def _close_tts_stream_locked():
+    global _tts_stream, _tts_stream_format
+    if _tts_stream is not None:
+        try:
+            _tts_stream.close() # close() aborts, nothing is waiting on a stream we're replacing
+        except Exception as e:
+            logger.debug("error closing tts output stream: %s", e)
+    _tts_stream, _tts_stream_format = None, None
+
+def _close_tts_stream():
+    """closes the shared tts stream, if open."""
+    with _tts_stream_lock:
+        _close_tts_stream_locked()
+
+def _play_tts_samples(data: np.ndarray, samplerate: int, device_id: int | None):
+    """plays decoded tts samples on the shared tts stream."""
+    data = data.reshape(len(data), -1) # mono comes back 1-d
+    _boost_tts(data)
+    with _tts_stream_lock:
+        _tts_output(samplerate, data.shape[1], device_id).write(data) # returns once the tail is buffered
+
+def _stream_tts_file(path: str, device_id: int | None):
+    """plays a cached tts wav block by block on the shared tts stream, so playback starts before the whole file is read."""
+    with sf.SoundFile(path) as f:
+        block_buffer = np.empty((TTS_BLOCKSIZE, f.channels), dtype='float32') # reused for every block
+        with _tts_stream_lock:
+            stream = _tts_output(f.samplerate, f.channels, device_id)
+            for block in f.blocks(out=block_buffer):
+                _boost_tts(block)
+                stream.write(block)
+
+def _store_tts(data: np.ndarray, samplerate: int, cache_path: str):
+    """writes decoded tts audio into the tts cache. failures only cost the cache entry."""
+    tmp_path = os.path.join(TTS_CACHE_DIR, f"tmp_{uuid.uuid4()}.wav") # renamed into place once complete
+    try:
+        sf.write(tmp_path, data, samplerate)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"could not cache tts audio at {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return
+    _evict_lru(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
 
+def cmd_tts(audio_player: AudioPlayer, user: Dict[str, Any], args: List[str]):
+    """handles the !tts command."""
     if not args:
         logger.warning(f"user {user['name']} used !tts without text.")
         # todo: send help message to user?
@@ -235,75 +615,38 @@ def cmd_tts(user: Dict[str, Any], args: List[str]):
     text_to_speak = " ".join(args)
     logger.info(f"user {user['name']} requested tts: '{text_to_speak}'")
 
-    # run tts generation and conversion in a separate thread
+    # run tts generation and decoding in a separate thread
     def generate_convert_and_play():
-        mp3_file_path = None # Initialize path variable
-        wav_file_path = None # Initialize path variable
         try:
-            logger.debug(f"generating tts for: '{text_to_speak}'")
-            tts = gTTS(text=text_to_speak, lang='en') # using english language
-            # generate unique filename for mp3
-            mp3_filename = f"tts_{uuid.uuid4()}.mp3"
-            mp3_file_path = os.path.join(TEMP_DOWNLOAD_DIR, mp3_filename)
-
-            logger.debug(f"saving tts audio to mp3: {mp3_file_path}")
-            tts.save(mp3_file_path)
-
-            if os.path.exists(mp3_file_path):
-                logger.info(f"tts mp3 audio saved successfully: {mp3_file_path}")
-
-                # Convert MP3 to WAV using pydub
-                try:
-                    logger.debug(f"converting {mp3_file_path} to wav...")
-                    sound: AudioSegment = AudioSegment.from_mp3(mp3_file_path)
-                    # --- Boost TTS Volume ---
-                    boost_db = 6.0 # Boost by 6 dB (adjust as needed)
-                    boosted_sound = sound + boost_db
-                    wav_filename = os.path.splitext(mp3_filename)[0] + ".wav"
-                    logger.debug(f"Boosting TTS volume by {boost_db} dB")
-                    wav_file_path = os.path.join(TEMP_DOWNLOAD_DIR, wav_filename)
-                    boosted_sound.export(wav_file_path, format="wav") # Export boosted sound
-                    logger.info(f"converted tts audio to wav: {wav_file_path}")
-
-                    # Queue the WAV file for playback
-                    # --- Modification: Play directly instead of queueing ---
-                    if os.path.exists(wav_file_path):
-                        try:
-                            logger.debug(f"Attempting direct playback of TTS WAV: {wav_file_path}")
-                            # --- Get the configured output device ---
-                            device_id = _audio_player_instance.get_output_device_id()
-                            logger.debug(f"Using output device ID: {device_id} for TTS playback.")
-                            # ----------------------------------------
-                            data, samplerate = sf.read(wav_file_path, dtype='float32')
-                            # --- Play on the configured device ---
-                            sd.play(data, samplerate, blocking=True, device=device_id) # Play and wait
-                            logger.info(f"Finished direct playback of TTS: {wav_file_path}")
-                            # --- Add WAV cleanup after successful playback ---
-                            try:
-                                os.remove(wav_file_path)
-                                logger.debug(f"Cleaned up temporary TTS WAV file: {wav_file_path}")
-                            except Exception as del_wav_e:
-                                logger.error(f"Error deleting temporary TTS WAV file {wav_file_path}: {del_wav_e}")
-                        except Exception as play_e:
-                            logger.error(f"Error during direct sounddevice playback of {wav_file_path}: {play_e}", exc_info=True)
-                    else:
-                        logger.error(f"wav file path reported but not found after conversion: {wav_file_path}")
-
-                except Exception as convert_e:
-                    logger.error(f"error converting mp3 to wav for '{mp3_file_path}': {convert_e}", exc_info=True)
-                    # todo: notify user of conversion failure?
-                # This inner finally block handles cleanup after conversion attempt
-                finally:
-                    # Clean up the intermediate MP3 file regardless of conversion success
-                    if mp3_file_path and os.path.exists(mp3_file_path):
-                        try:
-                            os.remove(mp3_file_path)
-                            logger.debug(f"Cleaned up temporary MP3 file: {mp3_file_path}")
-                        except Exception as del_e:
-                            logger.error(f"Error deleting temporary MP3 file {mp3_file_path}: {del_e}")
-
+            _ensure_temp_dirs()
+            cache_path = _tts_cache_path(text_to_speak)
+            data = None # decoded samples, when we had to generate them
+            if _cache_lookup(cache_path):
+                logger.info(f"using cached tts audio for '{text_to_speak}': {cache_path}")
             else:
-                 logger.error(f"TTS MP3 file path reported but not found after saving: {mp3_file_path}")
+                logger.debug("generating tts for: '%s'", text_to_speak)
+                tts = gTTS(text=text_to_speak, lang=TTS_LANG)
+                mp3_buffer = io.BytesIO() # the mp3 never touches the disk
+                tts.write_to_fp(mp3_buffer)
+                mp3_buffer.seek(0)
+                logger.debug("decoding %d bytes of tts mp3", mp3_buffer.getbuffer().nbytes)
+                data, samplerate = _decode_mp3(mp3_buffer)
+                _store_tts(data, samplerate, cache_path) # keep it for the next time someone says the same thing
+
+            # --- Play directly instead of queueing ---
+            try:
+                # --- Get the configured output device ---
+                device_id = audio_player.get_output_device_id()
+                logger.debug("Using output device ID: %s for TTS playback.", device_id)
+                # ----------------------------------------
+                # --- Play on the configured device, boosted by TTS_BOOST_DB ---
+                if data is None:
+                    _stream_tts_file(cache_path, device_id) # starts after the first block is read
+                else:
+                    _play_tts_samples(data, samplerate, device_id)
+                logger.info(f"Finished direct playback of TTS: '{text_to_speak}'")
+            except Exception as play_e:
+                logger.error(f"Error during direct sounddevice playback of TTS '{text_to_speak}': {play_e}", exc_info=True)
 
         except gTTSError as e:
              logger.error(f"gTTS error generating speech for '{text_to_speak}': {e}", exc_info=True)
@@ -311,75 +654,66 @@ def cmd_tts(user: Dict[str, Any], args: List[str]):
         except Exception as e:
              logger.error(f"Unexpected error during TTS processing for '{text_to_speak}': {e}", exc_info=True)
              # todo: notify user of failure?
-        # This outer finally block ensures cleanup attempt for both files regardless of where errors occurred
-        finally:
-            logger.debug(f"Running final cleanup for TTS thread (Text: '{text_to_speak[:30]}...')")
-            # Clean up MP3 if it still exists (might happen if error occurred before inner finally)
-            if mp3_file_path and os.path.exists(mp3_file_path):
-                try:
-                    os.remove(mp3_file_path)
-                    logger.debug(f"Cleaned up leftover temporary MP3 file: {mp3_file_path}")
-                except Exception as del_e:
-                    logger.error(f"Error deleting leftover temporary MP3 file {mp3_file_path}: {del_e}")
-            # Clean up WAV file if it exists
-            if wav_file_path and os.path.exists(wav_file_path):
-                try:
-                    os.remove(wav_file_path)
-                    logger.debug(f"Cleaned up temporary WAV file: {wav_file_path}")
-                except Exception as del_e:
-                    logger.error(f"Error deleting temporary WAV file {wav_file_path}: {del_e}")
-
-
-    tts_thread = threading.Thread(target=generate_convert_and_play, daemon=True)
-    tts_thread.start()
+
+    _submit(_tts_pool, _tts_slots, generate_convert_and_play, "tts")
 
 
 # --- registration ---
 
+# name, handler, aliases, help text, admin only
+_CORE_COMMANDS = (
+    ("play", cmd_play, ["p"], "plays audio from a youtube url or search query. usage: !play <url_or_search_terms>", False), # Allow all users
+    ("stop", cmd_stop, ["s"], "stops the current audio playback and clears the queue.", True), # mark as admin only
+    ("queue", cmd_queue, ["q", "list"], "shows the current playback queue in the console.", True), # keep admin only for consistency? or allow all? let's keep admin for now.
+    ("skip", cmd_skip, ["next"], "skips the currently playing song.", True), # usually admin only
+    ("tts", cmd_tts, [], "converts text to speech and plays it. usage: !tts <text to speak>", False), # Allow all users
+)
+
+def _import_audio_backends():
+    """imports sounddevice and soundfile into the module namespace, and checks which containers soundfile can play."""
+    global sd, sf, _DIRECT_PLAY_EXTS, _CACHED_EXTS, _MP3_NATIVE
+    if sd is None:
+        import sounddevice as sd
+    if sf is None:
+        import soundfile as sf
+        formats = sf.available_formats()
+        _DIRECT_PLAY_EXTS = frozenset(ext for ext in ('.flac', '.ogg', '.mp3') if ext[1:].upper() in formats)
+        _CACHED_EXTS = ('.wav', *sorted(_DIRECT_PLAY_EXTS))
+        _MP3_NATIVE = '.mp3' in _DIRECT_PLAY_EXTS
+
+def _trim_caches():
+    """brings both caches back under their limits, e.g. after the limits were lowered since the last run."""
+    try:
+        _ensure_temp_dirs()
+        _evict_download_cache()
+        _evict_lru(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+    except Exception as e:
+        logger.warning(f"could not trim the audio caches: {e}")
+
+def _with_audio_player(handler: Callable[..., None], audio_player: AudioPlayer | None) -> Callable[[Dict[str, Any], List[str]], None]:
+    """binds the audio player into a handler taking (audio_player, user, args), giving the (user, args) signature commands use.
+
+    the player is checked once here instead of on every command.
+    """
+    if audio_player is None:
+        command_name = handler.__name__[len("cmd_"):]
+        def unavailable(user: Dict[str, Any], args: List[str]):
+            logger.error(f"audioplayer instance not available for !{command_name} command.")
+        return unavailable
+    return functools.partial(handler, audio_player)
+
 def register(command_manager: CommandManager, audio_player: AudioPlayer):
     """registers the core commands with the commandmanager."""
-    global _audio_player_instance
-    _audio_player_instance = audio_player # store the audio player instance
-
-    command_manager.register_command(
-        name="play",
-        func=cmd_play,
-        aliases=["p"],
-        help_text="plays audio from a youtube url or search query. usage: !play <url_or_search_terms>",
-        admin_only=False, # Allow all users
-        source="core"
-    )
-    command_manager.register_command(
-        name="stop",
-        func=cmd_stop,
-        aliases=["s"],
-        help_text="stops the current audio playback and clears the queue.",
-        admin_only=True, # mark as admin only
-        source="core"
-    )
-    command_manager.register_command(
-        name="queue",
-        func=cmd_queue,
-        aliases=["q", "list"],
-        help_text="shows the current playback queue in the console.",
-        admin_only=True, # keep admin only for consistency? or allow all? let's keep admin for now.
-        source="core"
-    )
-    command_manager.register_command(
-        name="skip",
-        func=cmd_skip,
-        aliases=["next"],
-        help_text="skips the currently playing song.",
-        admin_only=True, # usually admin only
-        source="core"
-    )
-    command_manager.register_command(
-        name="tts",
-        func=cmd_tts,
-        aliases=[], # no aliases for now
-        help_text="converts text to speech and plays it. usage: !tts <text to speak>",
-        admin_only=False, # Allow all users
-        source="core"
+    global _download_pool, _ffmpeg_pool, _tts_pool
+    _import_audio_backends()
+    _download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="dl")
+    _ffmpeg_pool = ThreadPoolExecutor(max_workers=FFMPEG_WORKERS, thread_name_prefix="ffmpeg")
+    _tts_pool = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+    _download_pool.submit(_trim_caches) # in the background, startup doesn't wait on the directory scans
+
+    command_manager.register_many(
+        dict(name=name, func=_with_audio_player(handler, audio_player), aliases=aliases, help_text=help_text, admin_only=admin_only, source="core")
+        for name, handler, aliases, help_text, admin_only in _CORE_COMMANDS
     )
     # register other core commands here if needed
     logger.info("core commands registered.")
@@ -387,17 +721,19 @@ def register(command_manager: CommandManager, audio_player: AudioPlayer):
 def unregister(command_manager: CommandManager):
      """unregisters core commands."""
      # example - implement if needed for dynamic reloading
-     command_manager.unregister_command("play")
-     command_manager.unregister_command("stop")
-     command_manager.unregister_command("queue")
-     command_manager.unregister_command("skip")
-     command_manager.unregister_command("tts") # unregister tts too
+     for name, *_ in _CORE_COMMANDS:
+         command_manager.unregister_command(name)
+     # drop queued jobs, running ones finish on their own
+     for pool in (_download_pool, _ffmpeg_pool, _tts_pool):
+         if pool:
+             pool.shutdown(wait=False, cancel_futures=True)
+     _close_tts_stream()
      logger.info("core commands unregistered.")
 
 
 # example usage (can be removed or kept for testing)
 if __name__ == '__main__':
-    # Requires ffmpeg/ffprobe to be installed and in PATH for pydub conversion
+    # Requires ffmpeg to be installed and in PATH for !play conversion (and !tts decoding with an older libsndfile)
     logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
 
     # mock components for testing
@@ -411,8 +747,10 @@ if __name__ == '__main__':
                  if "tts_" in os.path.basename(file_path) and file_path.endswith(".wav"):
                      try: os.remove(file_path)
                      except Exception: pass
+                 return True
             else:
                  print(f"--- mock audio player: file not found {file_path} ---")
+                 return False
 
     class MockEventBus: pass # not used directly by core_commands
     mock_bus = MockEventBus()
@@ -428,7 +766,7 @@ if __name__ == '__main__':
         print("simulating command execution for '!play never gonna give you up'")
         # need to run in main thread for testing download directly here
         # in real app, the thread inside cmd_play handles it
-        _download_audio("never gonna give you up") # test download part
+        print(f"downloaded: {_download_audio('never gonna give you up').result()}") # test download part
 
         # test the command function itself (which starts a thread)
         # play_cmd.execute({"name": "testuser"}, ["never", "gonna", "give", "you", "up"])
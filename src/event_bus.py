@@ -18,14 +18,14 @@ class EventBus:
             return
 
         self._subscribers[event_type].append(callback)
-        logger.debug(f"callback {callback.__name__} subscribed to event '{event_type}'")
+        logger.debug("callback %s subscribed to event '%s'", callback.__name__, event_type)
 
     def unsubscribe(self, event_type: str, callback: Callable):
         """unsubscribe a callback function from an event type."""
         if event_type in self._subscribers:
             try:
                 self._subscribers[event_type].remove(callback)
-                logger.debug(f"callback {callback.__name__} unsubscribed from event '{event_type}'")
+                logger.debug("callback %s unsubscribed from event '%s'", callback.__name__, event_type)
                 # clean up event type if no subscribers left
                 if not self._subscribers[event_type]:
                     del self._subscribers[event_type]
@@ -37,16 +37,16 @@ class EventBus:
     def publish(self, event_type: str, *args: Any, **kwargs: Any):
         """publish an event to all subscribed callbacks."""
         if event_type not in self._subscribers:
-            logger.debug(f"published event '{event_type}' but no subscribers found.")
+            logger.debug("published event '%s' but no subscribers found.", event_type)
             return
 
-        logger.debug(f"publishing event '{event_type}' to {len(self._subscribers[event_type])} subscribers.")
+        logger.debug("publishing event '%s' to %s subscribers.", event_type, len(self._subscribers[event_type]))
         # iterate over a copy in case a callback modifies the subscriber list during iteration
         for callback in self._subscribers[event_type][:]:
             try:
                 # consider running callbacks in threads/async if they might block
                 callback(*args, **kwargs)
-                logger.debug(f"executed callback {callback.__name__} for event '{event_type}'")
+                logger.debug("executed callback %s for event '%s'", callback.__name__, event_type)
             except Exception as e:
                 logger.error(f"error executing callback {callback.__name__} for event '{event_type}': {e}", exc_info=True)
 
@@ -21,6 +21,8 @@ class Executor:
 
     def __init__(self, config: Dict[str, Any], command_manager: CommandManager, event_bus: EventBus):
         self._config = config # store config
+        admin_user = config.get("admin_user")
+        self._admin_user: Optional[str] = admin_user.strip() if admin_user else None # read once, checked on every command
         self._command_manager = command_manager
         self._event_bus = event_bus
         # --- State for duplicate command detection ---
@@ -36,7 +38,7 @@ class Executor:
     def _subscribe_to_events(self):
         """subscribes the command execution handler to the relevant event."""
         self._event_bus.subscribe(EVENT_COMMAND_DETECTED, self.handle_command_event)
-        logger.debug(f"executor subscribed to '{EVENT_COMMAND_DETECTED}' event.")
+        logger.debug("executor subscribed to '%s' event.", EVENT_COMMAND_DETECTED)
 
     def handle_command_event(self, user: Dict[str, Any], command: str, args: List[str]):
         """handles the command detected event."""
@@ -64,8 +66,8 @@ class Executor:
         # --- End Duplicate Check ---
 
         # --- Rate Limiting Check (Non-Admins) ---
-        admin_user = self._config.get("admin_user")
-        is_admin = admin_user and user_name and user_name.strip() == admin_user.strip()
+        admin_user = self._admin_user
+        is_admin = admin_user and user_name and user_name.strip() == admin_user
 
         if not is_admin:
             # Use username for rate limiting if user_name is valid
@@ -78,7 +80,7 @@ class Executor:
                         return # Ignore command due to rate limit
 
                 # If rate limit passed or first command for this user, update timestamp
-                logger.debug(f"Updating last command time for non-admin user '{user_name}'")
+                logger.debug("Updating last command time for non-admin user '%s'", user_name)
                 self._user_last_command_time[user_name] = current_time
             else:
                 logger.warning(f"Cannot apply rate limit: Username not found in user data: {user}. Allowing command.")
@@ -86,14 +88,14 @@ class Executor:
 
 
         # log the raw user dict received (after duplicate check)
-        logger.debug(f"Executor processing command event: User Dict={user}, Command={command}, Args={args}")
+        logger.debug("Executor processing command event: User Dict=%s, Command=%s, Args=%s", user, command, args)
 
         cmd_obj: Command | None = self._command_manager.get_command(command_name)
 
         if cmd_obj:
             # --- admin check ---
             # is_admin check already performed above for rate limiting
-            logger.debug(f"Admin check for command execution: is_admin={is_admin}")
+            logger.debug("Admin check for command execution: is_admin=%s", is_admin)
 
             if cmd_obj.admin_only and not is_admin:
                 logger.warning(f"Non-admin user '{user_name}' attempted to run admin command '!{command_name}'. Ignoring.")
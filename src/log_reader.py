@@ -77,17 +77,17 @@ class LogFileEventHandler(FileSystemEventHandler):
                 # read the new content
                 self._file.seek(self._last_size)
                 new_content = self._file.read(current_size - self._last_size)
-                logger.debug(f"read {len(new_content)} bytes from log file.") # log bytes read
+                logger.debug("read %s bytes from log file.", len(new_content)) # log bytes read
                 if new_content:
                     # log the raw content read before splitting lines
-                    logger.debug(f"raw content read:\n---\n{new_content}\n---")
+                    logger.debug("raw content read:\n---\n%s\n---", new_content)
                     lines = new_content.splitlines()
                     # --- Add small delay to potentially coalesce rapid events ---
                     time.sleep(0.1)
                     # -----------------------------------------------------------
                     for i, line in enumerate(lines):
                          if line: # avoid processing empty lines
-                            logger.debug(f"processing line {i+1}/{len(lines)}: '{line}'") # log each line being processed
+                            logger.debug("processing line %s/%s: '%s'", i+1, len(lines), line) # log each line being processed
                             self._process_new_line(line)
 
             self._last_size = self._file.tell() # update position after reading/seeking
@@ -166,7 +166,7 @@ class LogReader:
         # --- end duplicate check ---
 
         # proceed with processing every line read
-        logger.debug(f"processing line: {line}")
+        logger.debug("processing line: %s", line)
 
         # --- Try matching different chat formats ---
         user_info = None
@@ -201,7 +201,7 @@ class LogReader:
             user_name = raw_user_name # Start with raw name for stripping
             stripped_tags = [] # Store potentially multiple tags
             possible_tags = ["*DEAD*", "*TEAM*", "[TEAM]", "*SPEC*", "[SPEC]", "[DEAD]"]
-            logger.debug(f"Starting tag stripping for raw name: '{user_name}'") # Debug log before loop
+            logger.debug("Starting tag stripping for raw name: '%s'", user_name) # Debug log before loop
 
             # --- Loop to strip multiple tags ---
             while True:
@@ -212,14 +212,14 @@ class LogReader:
                     if user_name.startswith(tag + " "):
                         stripped_tags.append(tag)
                         user_name = user_name[len(tag)+1:].strip()
-                        logger.debug(f"Stripped tag '{tag} ', remaining: '{user_name}'") # Debug log inside loop
+                        logger.debug("Stripped tag '%s ', remaining: '%s'", tag, user_name) # Debug log inside loop
                         tag_found_in_pass = True
                         break # Restart tag check from beginning with stripped name
                     # Check for tag without space (less common but possible)
                     elif user_name.startswith(tag):
                          stripped_tags.append(tag)
                          user_name = user_name[len(tag):].strip()
-                         logger.debug(f"Stripped tag '{tag}', remaining: '{user_name}'") # Debug log inside loop
+                         logger.debug("Stripped tag '%s', remaining: '%s'", tag, user_name) # Debug log inside loop
                          tag_found_in_pass = True
                          break # Restart tag check from beginning with stripped name
 
@@ -231,7 +231,7 @@ class LogReader:
                     logger.warning(f"Tag stripping loop encountered potential infinite loop for '{raw_user_name}'. Breaking.")
                     break
             # --- End loop ---
-            logger.debug(f"Finished tag stripping. Final name: '{user_name}', Tags: {stripped_tags}") # Debug log after loop
+            logger.debug("Finished tag stripping. Final name: '%s', Tags: %s", user_name, stripped_tags) # Debug log after loop
 
             if not user_name: # Safety check after stripping
                 logger.warning(f"Could not extract final user name after stripping tags from: {raw_user_name}")
@@ -251,7 +251,7 @@ class LogReader:
                 args_str = parts[1].strip() if len(parts) > 1 else "" # strip args string too
                 args_list = args_str.split() # simple space splitting for now
                 logger.info(f"Command detected: user={user_info['name']}, command={command}, args={args_list}")
-                logger.debug(f"publishing event_command_detected with user_info: {user_info}")
+                logger.debug("publishing event_command_detected with user_info: %s", user_info)
                 self._event_bus.publish(EVENT_COMMAND_DETECTED, user=user_info, command=command, args=args_list)
             else:
                 # Regular chat message
@@ -270,7 +270,7 @@ class LogReader:
         # add checks for connect_regex, suicide_regex etc. here...
 
         # if no specific pattern matched
-        logger.debug(f"undefined message: {line}")
+        logger.debug("undefined message: %s", line)
         self._event_bus.publish(EVENT_UNDEFINED_MESSAGE, message=line)
 
 
@@ -2,6 +2,7 @@ import sys
 import os
 import time
 import shutil
+import gc
 import logging
 # add project root to path so we can import stuff easier
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -10,7 +11,7 @@ sys.path.insert(0, project_root)
 from src.config import load_config, ConfigError # Import ConfigError
 from src.logger import setup_logging
 from src.event_bus import EventBus
-from src.core_commands import TEMP_DOWNLOAD_DIR # Import the temp dir path
+from src.core_commands import TEMP_DOWNLOAD_DIR, DOWNLOAD_CACHE_DIR, TTS_CACHE_DIR # Import the temp dir path
 from src.log_reader import LogReader
 from src.command_manager import CommandManager
 from src.executor import Executor
@@ -20,7 +21,7 @@ import src.core_commands as core_commands # import our basic commands
 
 logger = logging.getLogger(__name__) # Define logger at module level
 def cleanup_temp_folder():
-    """Removes all files and subdirectories within the TEMP_DOWNLOAD_DIR."""
+    """Removes all files and subdirectories within the TEMP_DOWNLOAD_DIR, except the download and tts caches."""
     logger.info(f"Attempting to clean up temporary folder: {TEMP_DOWNLOAD_DIR}")
     if not os.path.exists(TEMP_DOWNLOAD_DIR):
         logger.info("Temporary folder does not exist, nothing to clean.")
@@ -30,6 +31,8 @@ def cleanup_temp_folder():
     error_count = 0
     for item_name in os.listdir(TEMP_DOWNLOAD_DIR):
         item_path = os.path.join(TEMP_DOWNLOAD_DIR, item_name)
+        if item_path in (DOWNLOAD_CACHE_DIR, TTS_CACHE_DIR):
+            continue # cached audio is kept between runs
         try:
             if os.path.isfile(item_path) or os.path.islink(item_path):
                 os.unlink(item_path) # Remove file or link
@@ -109,6 +112,11 @@ def main():
 
     logging.info("Log monitoring started.")
 
+    # a cyclic gc pass holds the gil long enough to starve the audio callback. move everything
+    # built during startup out of the collector's reach, so later passes only scan what's new
+    gc.collect()
+    gc.freeze()
+
     # keep the main script running using a sleep loop, responsive to KeyboardInterrupt
     try:
         while True:
@@ -131,7 +139,8 @@ def main():
             audio_player.shutdown()
         if 'plugin_manager' in locals() and plugin_manager:
             plugin_manager.unload_plugins() # unload the plugins
-        # core_commands.unregister(command_manager) # optional: unregister basic commands if we need to
+        if 'command_manager' in locals() and command_manager:
+            core_commands.unregister(command_manager) # also drops queued download/tts jobs, so exit doesn't wait on them
         # executor.shutdown() # executor doesn't need a special shutdown right now
 
         # --- Cleanup Temp Folder ---